@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import hashlib
+from typing import Any, Dict, Hashable, Optional, Tuple, Union
+
+import orjson
+from cachetools import TTLCache
+from fastapi import Request, Response
+
+# Rows served by the GET-by-id handlers, keyed by (kind, id) -> (row, etag).
+# Handlers run on the event loop thread, so the cache needs no locking. Entries are
+# invalidated by the patch/delete handlers of this process; the TTL bounds staleness
+# for writes made elsewhere (other workers, the KB ingest).
+_entries: TTLCache = TTLCache(maxsize=10000, ttl=30)
+
+# Totals of the big list endpoints when the client didn't ask for an exact count,
+# keyed by (count statement, filter binds). Short-lived: a total that lags a few
+# seconds behind is fine for a pager, a full count per page request is not.
+_counts: TTLCache = TTLCache(maxsize=1024, ttl=15)
+
+CacheEntry = Tuple[Dict[str, Any], str]
+
+
+def _etag(row: Dict[str, Any]) -> str:
+    return '"' + hashlib.blake2s(orjson.dumps(row)).hexdigest()[:16] + '"'
+
+
+def get(kind: str, key: Hashable) -> Optional[CacheEntry]:
+    return _entries.get((kind, key))
+
+
+def entry_for(row: Dict[str, Any]) -> CacheEntry:
+    """(row, etag) without storing it, for rows that must not be cached."""
+    return (row, _etag(row))
+
+
+def put(kind: str, key: Hashable, row: Dict[str, Any]) -> CacheEntry:
+    entry = entry_for(row)
+    _entries[(kind, key)] = entry
+    return entry
+
+
+def invalidate(kind: str, key: Hashable) -> None:
+    _entries.pop((kind, key), None)
+
+
+def invalidate_kind(kind: str) -> None:
+    for k in [k for k in list(_entries.keys()) if k[0] == kind]:
+        _entries.pop(k, None)
+
+
+def get_count(key: Hashable) -> Optional[int]:
+    return _counts.get(key)
+
+
+def put_count(key: Hashable, total: int) -> None:
+    _counts[key] = total
+
+
+def clear_counts() -> None:
+    _counts.clear()
+
+
+def clear() -> None:
+    _entries.clear()
+    _counts.clear()
+
+
+def respond(request: Request, response: Response, entry: CacheEntry) -> Union[Dict[str, Any], Response]:
+    """Return the cached row with its ETag, or a bare 304 if the client already has it."""
+    row, etag = entry
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+        if etag in tags or "*" in tags:
+            return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return row
@@ -1,13 +1,28 @@
 from __future__ import annotations
 
-from typing import Optional
-from uuid import UUID
+import base64
+import itertools
+from datetime import datetime
+from functools import lru_cache
+import re
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+from uuid import UUID, uuid4
 
-from fastapi import APIRouter, HTTPException, Query, status
-from sqlalchemy import text
+import asyncpg
+import orjson
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import bindparam, delete, func, insert, select, text, update
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.sql.base import Executable
+from sqlalchemy.sql.elements import TextClause
 
-from app.core.db import db_session
+from app.api import cache
+from app.core.config import settings
+from app.core.db import async_db_session
+from app.core.responses import ORJSONResponse
+from app.core.tables import campaigns, kb_documents
 from app.api.schemas import (
     # campaigns
     CampaignCreateRequest,
@@ -36,12 +51,567 @@ from app.api.schemas import (
     # docs
     DocumentResponse,
     DocumentListResponse,
+    DocumentBulkCreateRequest,
+    DocumentBulkCreateResponse,
     ChunkResponse,
     ChunkListResponse,
 )
-from app.kb.update import update_campaign_kb
+from app.kb import worker as kb_worker
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+
+
+# Binds that select the page rather than the counted set.
+_PAGE_PARAMS = frozenset({"limit", "offset", "cur_key", "cur_id"})
+
+
+async def _estimated_total(db, count_sql: TextClause, params: Dict[str, Any]) -> int:
+    """Total for a page built without `_total`: the count statement's result, cached
+    for a few seconds per filter combination (see `_compose_page_sql`)."""
+    key = (count_sql.text, tuple(sorted((k, v) for k, v in params.items() if k not in _PAGE_PARAMS)))
+    total = cache.get_count(key)
+    if total is None:
+        total = (await db.execute(count_sql, params)).scalar_one()
+        cache.put_count(key, total)
+    return total
+
+
+async def _fetch_page(
+    db, page_sql: Executable, count_sql: Executable, params: Dict[str, Any]
+) -> Tuple[List[Dict[str, Any]], int]:
+    """Run a page query projecting `count(*) OVER () AS _total`; return (items, total).
+
+    The total rides on every page row, so it costs no extra round-trip. Past the last
+    page there is no row to carry it and we fall back to the count statement.
+    Items are zipped from the raw row tuples: `_total` is the last column, so zipping
+    with the other keys drops it without a per-column filter. Pages composed without
+    `_total` take their total from `_estimated_total`.
+    """
+    result = await db.execute(page_sql, params)
+    rows = result.all()
+    keys = tuple(result.keys())
+    if keys[-1] != "_total":
+        return [dict(zip(keys, r)) for r in rows], await _estimated_total(db, count_sql, params)
+    if rows:
+        return [dict(zip(keys[:-1], r)) for r in rows], rows[0][-1]
+    if params.get("offset") or "cur_key" in params:
+        return [], (await db.execute(count_sql, params)).scalar_one()
+    return [], 0
+
+
+# Rows pulled per round-trip from the server-side cursor of a streamed page.
+_STREAM_BATCH = 200
+
+
+async def _stream_page(
+    page_sql: TextClause,
+    count_sql: TextClause,
+    params: Dict[str, Any],
+    meta: Dict[str, Any],
+    next_cursor: Optional[Callable[[Dict[str, Any]], Any]] = None,
+) -> AsyncIterator[bytes]:
+    """Encode a `_fetch_page` page as JSON while its rows arrive from a server-side cursor.
+
+    Only one batch is held in memory whatever the page size. `total` (and `next_cursor`
+    from `next_cursor(last_row)` on a full page) go after the items, once they are known.
+    The generator opens its own session: FastAPI tears down request dependencies
+    before a StreamingResponse body is sent.
+    """
+    async with async_db_session() as db:
+        result = await db.stream(page_sql, params, execution_options={"yield_per": _STREAM_BATCH})
+        keys = tuple(result.keys())
+        windowed = keys[-1] == "_total"
+        if windowed:
+            keys = keys[:-1]
+        yield b'{"items":['
+        sep = b""
+        total = None
+        count = 0
+        last = None
+        async for batch in result.partitions():
+            rows = [dict(zip(keys, r)) for r in batch]
+            if windowed:
+                total = batch[0][-1]
+            count += len(rows)
+            last = rows[-1]
+            yield sep + b",".join(orjson.dumps(r) for r in rows)
+            sep = b","
+        if not windowed:
+            total = await _estimated_total(db, count_sql, params)
+        elif total is None:
+            total = 0
+            if params.get("offset") or "cur_key" in params:
+                total = (await db.execute(count_sql, params)).scalar_one()
+    tail = dict(meta, total=total)
+    if next_cursor is not None:
+        tail["next_cursor"] = next_cursor(last) if count == params["limit"] else None
+    yield b"]," + orjson.dumps(tail)[1:]
+
+
+_FK_VIOLATION = "23503"
+
+
+def _pgcode(e: IntegrityError) -> Optional[str]:
+    """SQLSTATE of the driver error behind an IntegrityError."""
+    for err in (e.orig, getattr(e.orig, "__cause__", None)):
+        code = getattr(err, "sqlstate", None) or getattr(err, "pgcode", None)
+        if code:
+            return code
+    return None
+
+
+async def _delete_returning(stmt: Executable, row_id: UUID) -> bool:
+    """Run a `DELETE ... RETURNING id`; False if nothing matched.
+
+    Commits only when a row went away (closing the session discards the empty
+    transaction). A foreign key still pointing at the row answers 409 instead of
+    surfacing as a 500.
+    """
+    async with async_db_session() as db:
+        try:
+            deleted = (await db.execute(stmt, {"id": row_id})).scalar()
+            if deleted:
+                await db.commit()
+        except IntegrityError as e:
+            await db.rollback()
+            if _pgcode(e) == _FK_VIOLATION:
+                raise HTTPException(status_code=409, detail="has dependent rows")
+            raise
+    return deleted is not None
+
+
+# `Key (col)=(value) ...` in the DETAIL of a unique/foreign-key violation.
+_KEY_DETAIL_RE = re.compile(r"Key \((?P<cols>[^)]*)\)=\((?P<vals>.*?)\)")
+
+
+def _violating_rows(cause: BaseException, rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Describe a constraint violation raised by a bulk write: the constraint and the
+    indexes of the input rows carrying the offending key (single-column keys only).
+
+    `cause` is the asyncpg error, as raised by COPY or found under an IntegrityError.
+    """
+    constraint = getattr(cause, "constraint_name", None)
+    detail = getattr(cause, "detail", None) or ""
+    indexes: List[int] = []
+    m = _KEY_DETAIL_RE.search(detail)
+    if m and "," not in m.group("cols"):
+        col, val = m.group("cols"), m.group("vals")
+        indexes = [i for i, r in enumerate(rows) if r.get(col) is not None and str(r[col]) == val]
+    return {"constraint": constraint, "message": detail or str(cause), "rows": indexes}
+
+
+# Document columns a client can select with `fields`, in SELECT order. `id` and
+# `updated_at` always come back: the list cursor is built from them.
+_DOCUMENT_FIELDS = (
+    "id", "campaign_id", "source_file_id", "doc_type", "title", "body_md",
+    "content_hash", "created_at", "updated_at",
+)
+_DOCUMENT_DEFAULT_FIELDS = tuple(f for f in _DOCUMENT_FIELDS if f != "body_md")
+
+
+def _document_fields(fields: Optional[str], include_body: bool = False) -> Tuple[str, ...]:
+    """Resolve a comma-separated `fields` param against the document column allowlist."""
+    if not fields:
+        chosen = set(_DOCUMENT_DEFAULT_FIELDS)
+    else:
+        chosen = {f.strip() for f in fields.split(",") if f.strip()}
+        unknown = chosen.difference(_DOCUMENT_FIELDS)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}.")
+        chosen |= {"id", "updated_at"}
+    if include_body:
+        chosen.add("body_md")
+    # Canonical order, so equal selections share one cached statement.
+    return tuple(f for f in _DOCUMENT_FIELDS if f in chosen)
+
+
+# Substring searches: pg_trgm can only use its index for patterns of at least one
+# trigram, so shorter terms would scan every row; the cap bounds the trigram set.
+_Q_MIN_LENGTH = 3
+_Q_MAX_LENGTH = 128
+
+
+def _like_pattern(q: str) -> str:
+    """ILIKE pattern for a literal substring search (served by the pg_trgm GIN indexes)."""
+    escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _encode_cursor(key: Any, row_id: Any) -> str:
+    """Opaque keyset cursor for the last row of a page: base64(`order_key|id`)."""
+    if isinstance(key, datetime):
+        key = key.isoformat()
+    return base64.urlsafe_b64encode(f"{key}|{row_id}".encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str, key_is_datetime: bool = False) -> Dict[str, Any]:
+    """Decode a cursor from `_encode_cursor` into the `cur_key`/`cur_id` binds."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        key, _, row_id = raw.rpartition("|")
+        return {
+            "cur_key": datetime.fromisoformat(key) if key_is_datetime else key,
+            "cur_id": UUID(row_id),
+        }
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor.")
+
+
+def _compose_page_sql(
+    table: str,
+    cols: str,
+    where_sql: str,
+    order_sql: str,
+    keyset_sql: Optional[str],
+    exact: bool = True,
+) -> Tuple[TextClause, TextClause]:
+    """(count, page) statements over `table`.
+
+    With `keyset_sql` the page seeks past the cursor row instead of scanning and
+    discarding OFFSET rows; the total is then counted over the unseeked filter, as
+    the window would only see the rows after the cursor.
+
+    With `exact=False` the page carries no `_total` and the caller caches the count
+    statement's result instead. Unfiltered, that statement reads the planner's row
+    estimate from pg_class rather than counting the table.
+    """
+    count_sql = text(f"SELECT count(*) FROM {table} WHERE {where_sql}")
+    if not exact:
+        if where_sql == "TRUE":
+            # reltuples is -1 until the table is first analyzed.
+            count_sql = text(
+                f"""
+                SELECT CASE WHEN c.reltuples < 0 THEN (SELECT count(*) FROM {table})
+                            ELSE c.reltuples::bigint END
+                FROM pg_class c
+                WHERE c.oid = '{table}'::regclass
+                """
+            )
+        page_where = f"{where_sql} AND {keyset_sql}" if keyset_sql else where_sql
+        page_limit = "LIMIT :limit" if keyset_sql else "LIMIT :limit OFFSET :offset"
+        page_sql = text(
+            f"""
+            SELECT {cols}
+            FROM {table}
+            WHERE {page_where}
+            ORDER BY {order_sql}
+            {page_limit}
+            """
+        )
+        return count_sql, page_sql
+    if keyset_sql:
+        total_sql = f"(SELECT count(*) FROM {table} WHERE {where_sql})"
+        page_where = f"{where_sql} AND {keyset_sql}"
+        page_limit = "LIMIT :limit"
+    else:
+        total_sql = "count(*) OVER ()"
+        page_where = where_sql
+        page_limit = "LIMIT :limit OFFSET :offset"
+    page_sql = text(
+        f"""
+        SELECT {cols},
+               {total_sql} AS _total
+        FROM {table}
+        WHERE {page_where}
+        ORDER BY {order_sql}
+        {page_limit}
+        """
+    )
+    return count_sql, page_sql
+
+
+# Bulk document loads above this size go through COPY instead of multi-row INSERTs.
+_COPY_THRESHOLD = 1000
+
+_DOCUMENT_COPY_COLS = (
+    "id", "campaign_id", "source_file_id", "workspace_id", "doc_type", "title",
+    "canonical_name", "frontmatter", "body_md", "content_hash",
+)
+
+
+# ----------------------------
+# SQL statements
+# ----------------------------
+# Statements are built once at import so every request reuses the same TextClause
+# (and SQLAlchemy's compiled cache entry) instead of re-parsing the SQL string.
+# UUIDs are bound as uuid.UUID and JSON columns through typed JSONB binds, so asyncpg
+# sends both in binary; None binds as SQL NULL rather than a JSON null.
+
+_JSONB = JSONB(none_as_null=True)
+
+# Campaign CRUD is built with Core constructs: their compiled form is cached by the
+# engine, so a repeat call skips SQL compilation entirely.
+_CAMPAIGN_COLS = (
+    campaigns.c.id,
+    campaigns.c.name,
+    campaigns.c.system,
+    campaigns.c.description,
+    campaigns.c.config,
+    campaigns.c.embedding_model,
+    campaigns.c.embedding_dim,
+)
+
+_SQL_INSERT_CAMPAIGN = insert(campaigns).returning(*_CAMPAIGN_COLS)
+
+_SQL_COUNT_CAMPAIGNS = select(func.count()).select_from(campaigns)
+
+_SQL_LIST_CAMPAIGNS = (
+    select(*_CAMPAIGN_COLS, func.count().over().label("_total"))
+    .order_by(campaigns.c.name)
+    .limit(bindparam("limit"))
+    .offset(bindparam("offset"))
+)
+
+_SQL_GET_CAMPAIGN = select(*_CAMPAIGN_COLS).where(campaigns.c.id == bindparam("id"))
+
+_SQL_DELETE_CAMPAIGN = delete(campaigns).where(campaigns.c.id == bindparam("id")).returning(campaigns.c.id)
+
+# The create statements insert nothing (and return no row) when the campaign is
+# missing, which saves a separate existence check. Binds in an INSERT ... SELECT are
+# not typed from the target columns, hence the casts.
+_SQL_INSERT_WORKSPACE = text(
+    """
+    INSERT INTO workspaces (campaign_id, name, purpose, state)
+    SELECT c.id, CAST(:name AS text), CAST(:purpose AS text), CAST(:state AS jsonb)
+    FROM campaigns c
+    WHERE c.id = CAST(:campaign_id AS uuid)
+    RETURNING id, campaign_id, name, purpose, state
+    """
+).bindparams(bindparam("state", type_=_JSONB))
+
+_SQL_COUNT_WORKSPACES = text("SELECT count(*) FROM workspaces")
+
+_SQL_COUNT_WORKSPACES_BY_CID = text("SELECT count(*) FROM workspaces WHERE campaign_id = :cid")
+
+_SQL_LIST_WORKSPACES = text(
+    """
+    SELECT id, campaign_id, name, purpose, state, count(*) OVER () AS _total
+    FROM workspaces
+    ORDER BY name
+    LIMIT :limit OFFSET :offset
+    """
+)
+
+_SQL_LIST_WORKSPACES_BY_CID = text(
+    """
+    SELECT id, campaign_id, name, purpose, state, count(*) OVER () AS _total
+    FROM workspaces
+    WHERE campaign_id = :cid
+    ORDER BY name
+    LIMIT :limit OFFSET :offset
+    """
+)
+
+_SQL_GET_WORKSPACE = text(
+    """
+    SELECT id, campaign_id, name, purpose, state
+    FROM workspaces
+    WHERE id = :id
+    """
+)
+
+_SQL_DELETE_WORKSPACE = text("DELETE FROM workspaces WHERE id = :id RETURNING id")
+
+_SOURCE_COLS = """id, campaign_id, name, kind, root_path, recursive, follow_symlinks,
+           include_globs, exclude_globs, change_detection, enabled, last_scan_at, last_ingest_at"""
+
+_SQL_INSERT_SOURCE = text(
+    f"""
+    INSERT INTO campaign_sources (
+      campaign_id, name, kind, root_path, recursive, follow_symlinks,
+      include_globs, exclude_globs, change_detection, enabled
+    )
+    SELECT
+      c.id, CAST(:name AS text), CAST(:kind AS text), CAST(:root_path AS text),
+      CAST(:recursive AS boolean), CAST(:follow_symlinks AS boolean),
+      CAST(:include_globs AS text[]), CAST(:exclude_globs AS text[]),
+      CAST(:change_detection AS text), CAST(:enabled AS boolean)
+    FROM campaigns c
+    WHERE c.id = CAST(:campaign_id AS uuid)
+    RETURNING {_SOURCE_COLS}
+    """
+)
+
+_SQL_COUNT_SOURCES = text("SELECT count(*) FROM campaign_sources")
+
+_SQL_COUNT_SOURCES_BY_CID = text("SELECT count(*) FROM campaign_sources WHERE campaign_id = :cid")
+
+_SQL_LIST_SOURCES = text(
+    f"""
+    SELECT {_SOURCE_COLS},
+           count(*) OVER () AS _total
+    FROM campaign_sources
+    ORDER BY name
+    LIMIT :limit OFFSET :offset
+    """
+)
+
+_SQL_LIST_SOURCES_BY_CID = text(
+    f"""
+    SELECT {_SOURCE_COLS},
+           count(*) OVER () AS _total
+    FROM campaign_sources
+    WHERE campaign_id = :cid
+    ORDER BY name
+    LIMIT :limit OFFSET :offset
+    """
+)
+
+_SQL_GET_SOURCE = text(
+    f"""
+    SELECT {_SOURCE_COLS}
+    FROM campaign_sources
+    WHERE id = :id
+    """
+)
+
+_SQL_DELETE_SOURCE = text("DELETE FROM campaign_sources WHERE id = :id RETURNING id")
+
+_SQL_LIST_SOURCE_FOLDERS = text(
+    """
+    SELECT id, source_id, rel_path, parent_id, depth, last_seen_at
+    FROM source_folders
+    WHERE source_id = :sid
+    ORDER BY depth, rel_path
+    """
+)
+
+_SQL_QUEUE_INGEST_RUN = text(
+    """
+    INSERT INTO ingest_runs (campaign_id, trigger, status)
+    SELECT c.id, 'api', 'queued'
+    FROM campaigns c
+    WHERE c.id = :cid
+    RETURNING id
+    """
+)
+
+_SQL_GET_INGEST_RUN = text(
+    """
+    SELECT id, campaign_id, trigger, status, started_at, finished_at, stats, error
+    FROM ingest_runs
+    WHERE id = :id
+    """
+)
+
+_SQL_LIST_INGEST_RUN_FILES = text(
+    """
+    SELECT ingest_run_id, source_file_id, action, status, reason, error
+    FROM ingest_run_files
+    WHERE ingest_run_id = :id
+    ORDER BY source_file_id
+    """
+)
+
+_SQL_GET_DOCUMENT = text(
+    """
+    SELECT id, campaign_id, source_file_id, doc_type, title, body_md, content_hash, created_at, updated_at
+    FROM kb_documents
+    WHERE id = :id
+    """
+)
+
+_SQL_DOCUMENT_CAMPAIGN = text("SELECT campaign_id FROM kb_documents WHERE id = :id")
+
+_SQL_LIST_CHUNKS_BULK = text(
+    """
+    SELECT id, campaign_id, document_id, section_path, chunk_index, content, metadata
+    FROM kb_chunks
+    WHERE document_id = ANY(CAST(:ids AS uuid[]))
+    ORDER BY document_id, chunk_index
+    """
+)
+
+_SQL_COUNT_CHUNKS, _SQL_LIST_CHUNKS = _compose_page_sql(
+    "kb_chunks",
+    "id, campaign_id, document_id, section_path, chunk_index, content, metadata",
+    "document_id = :id",
+    "chunk_index",
+    None,
+)
+
+# chunk_index is unique per document, so it is a cursor on its own.
+_, _SQL_LIST_CHUNKS_AFTER = _compose_page_sql(
+    "kb_chunks",
+    "id, campaign_id, document_id, section_path, chunk_index, content, metadata",
+    "document_id = :id",
+    "chunk_index",
+    "chunk_index > :cur_key",
+)
+
+
+@lru_cache(maxsize=64)
+def _patch_sql(table: str, columns: Tuple[str, ...], returning: str, json_columns: Tuple[str, ...] = ()) -> TextClause:
+    """UPDATE of only the patched `columns` (binds named after them), keyed by the set
+    of fields a client sends; untouched columns, TOASTed ones included, aren't rewritten."""
+    sets = ", ".join(f"{c} = :{c}" for c in columns)
+    stmt = text(f"UPDATE {table} SET {sets} WHERE id = :id RETURNING {returning}")
+    json_binds = [bindparam(c, type_=_JSONB) for c in json_columns if c in columns]
+    return stmt.bindparams(*json_binds) if json_binds else stmt
+
+
+@lru_cache(maxsize=64)
+def _source_files_sql(filters: Tuple[str, ...], keyset: bool, exact: bool) -> Tuple[TextClause, TextClause]:
+    """(count, page) statements for list_source_files, keyed by the active filter names."""
+    predicates = {
+        "status": "status = :status",
+        "lst": "last_ingest_status = :lst",
+        "q": "rel_path ILIKE :q",
+    }
+    where_sql = " AND ".join(["source_id = :sid"] + [predicates[f] for f in filters])
+    # error can hold a whole traceback; a listing only needs its head.
+    cols = """id, source_id, folder_id, rel_path, ext, size_bytes, mtime_epoch, sha256,
+               status, last_seen_at, last_ingested_at, last_ingest_status, left(error, 500) AS error"""
+    return _compose_page_sql(
+        "source_files",
+        cols,
+        where_sql,
+        "rel_path, id",
+        "(rel_path, id) > (:cur_key, :cur_id)" if keyset else None,
+        exact,
+    )
+
+
+@lru_cache(maxsize=16)
+def _ingest_runs_sql(filters: Tuple[str, ...], keyset: bool, exact: bool) -> Tuple[TextClause, TextClause]:
+    """(count, page) statements for list_ingest_runs, keyed by the active filter names."""
+    predicates = {"cid": "campaign_id = :cid"}
+    where_sql = " AND ".join([predicates[f] for f in filters]) or "TRUE"
+    return _compose_page_sql(
+        "ingest_runs",
+        "id, campaign_id, trigger, status, started_at, finished_at, stats, error",
+        where_sql,
+        "started_at DESC NULLS LAST, id DESC",
+        "(started_at, id) < (:cur_key, :cur_id)" if keyset else None,
+        exact,
+    )
+
+
+@lru_cache(maxsize=64)
+def _document_projection_sql(cols: Tuple[str, ...]) -> TextClause:
+    """get_document statement for a `fields` selection."""
+    return text(f"SELECT {', '.join(cols)} FROM kb_documents WHERE id = :id")
+
+
+@lru_cache(maxsize=256)
+def _documents_sql(
+    filters: Tuple[str, ...], cols: Tuple[str, ...], keyset: bool, exact: bool
+) -> Tuple[TextClause, TextClause]:
+    """(count, page) statements for list_documents, keyed by the active filter names."""
+    predicates = {
+        "dt": "doc_type = :dt",
+        "q": "(title ILIKE :q OR body_md ILIKE :q)",
+    }
+    where_sql = " AND ".join(["campaign_id = :cid"] + [predicates[f] for f in filters])
+
+    return _compose_page_sql(
+        "kb_documents",
+        ", ".join(cols),
+        where_sql,
+        "updated_at DESC NULLS LAST, id DESC",
+        "(updated_at, id) < (:cur_key, :cur_id)" if keyset else None,
+        exact,
+    )
 
 
 # ----------------------------
@@ -55,34 +625,24 @@ router = APIRouter()
     tags=["campaigns"],
     summary="Create a campaign (1 campaign = 1 KB).",
 )
-def create_campaign(payload: CampaignCreateRequest):
-    q = text(
-        """
-        INSERT INTO campaigns (name, system, description, config, embedding_model, embedding_dim)
-        VALUES (:name, :system, :description, :config::jsonb, :embedding_model, :embedding_dim)
-        RETURNING id, name, system, description, config, embedding_model, embedding_dim
-        """
-    )
-    with db_session() as db:
+async def create_campaign(payload: CampaignCreateRequest):
+    async with async_db_session() as db:
         try:
-            row = (
-                db.execute(
-                    q,
-                    {
-                        "name": payload.name,
-                        "system": payload.system,
-                        "description": payload.description,
-                        "config": payload.config,
-                        "embedding_model": payload.embedding_model,
-                        "embedding_dim": payload.embedding_dim,
-                    },
-                )
-                .mappings()
-                .one()
+            result = await db.execute(
+                _SQL_INSERT_CAMPAIGN,
+                {
+                    "name": payload.name,
+                    "system": payload.system,
+                    "description": payload.description,
+                    "config": payload.config,
+                    "embedding_model": payload.embedding_model,
+                    "embedding_dim": payload.embedding_dim,
+                },
             )
-            db.commit()
+            row = result.mappings().one()
+            await db.commit()
         except IntegrityError:
-            db.rollback()
+            await db.rollback()
             raise HTTPException(status_code=409, detail="Campaign name already exists.")
     return dict(row)
 
@@ -93,28 +653,15 @@ def create_campaign(payload: CampaignCreateRequest):
     tags=["campaigns"],
     summary="List campaigns.",
 )
-def list_campaigns(
+async def list_campaigns(
     limit: int = Query(50, ge=1, le=500),
     offset: int = Query(0, ge=0),
 ):
-    with db_session() as db:
-        total = db.execute(text("SELECT count(*) FROM campaigns")).scalar_one()
-        rows = (
-            db.execute(
-                text(
-                    """
-                    SELECT id, name, system, description, config, embedding_model, embedding_dim
-                    FROM campaigns
-                    ORDER BY name
-                    LIMIT :limit OFFSET :offset
-                    """
-                ),
-                {"limit": limit, "offset": offset},
-            )
-            .mappings()
-            .all()
+    async with async_db_session() as db:
+        items, total = await _fetch_page(
+            db, _SQL_LIST_CAMPAIGNS, _SQL_COUNT_CAMPAIGNS, {"limit": limit, "offset": offset}
         )
-    return {"items": [dict(r) for r in rows], "total": total, "limit": limit, "offset": offset}
+    return {"items": items, "total": total, "limit": limit, "offset": offset}
 
 
 @router.get(
@@ -123,25 +670,20 @@ def list_campaigns(
     tags=["campaigns"],
     summary="Get campaign by id.",
 )
-def get_campaign(campaign_id: UUID):
-    with db_session() as db:
-        row = (
-            db.execute(
-                text(
-                    """
-                    SELECT id, name, system, description, config, embedding_model, embedding_dim
-                    FROM campaigns
-                    WHERE id = :id
-                    """
-                ),
-                {"id": str(campaign_id)},
-            )
-            .mappings()
-            .first()
-        )
-        if not row:
-            raise HTTPException(status_code=404, detail="Campaign not found.")
-    return dict(row)
+async def get_campaign(campaign_id: UUID, request: Request, response: Response):
+    return cache.respond(request, response, await _load_campaign(campaign_id))
+
+
+async def _load_campaign(campaign_id: UUID) -> cache.CacheEntry:
+    entry = cache.get("campaign", campaign_id)
+    if entry is None:
+        async with async_db_session() as db:
+            result = await db.execute(_SQL_GET_CAMPAIGN, {"id": campaign_id})
+            row = result.mappings().first()
+            if not row:
+                raise HTTPException(status_code=404, detail="Campaign not found.")
+        entry = cache.put("campaign", campaign_id, dict(row))
+    return entry
 
 
 @router.patch(
@@ -150,48 +692,27 @@ def get_campaign(campaign_id: UUID):
     tags=["campaigns"],
     summary="Update campaign fields.",
 )
-def patch_campaign(campaign_id: UUID, payload: CampaignPatchRequest):
-    # Build a single UPDATE with COALESCE so we can patch safely.
-    q = text(
-        """
-        UPDATE campaigns
-        SET
-          name = COALESCE(:name, name),
-          system = COALESCE(:system, system),
-          description = COALESCE(:description, description),
-          config = COALESCE(:config::jsonb, config),
-          embedding_model = COALESCE(:embedding_model, embedding_model),
-          embedding_dim = COALESCE(:embedding_dim, embedding_dim)
-        WHERE id = :id
-        RETURNING id, name, system, description, config, embedding_model, embedding_dim
-        """
-    )
-    with db_session() as db:
+async def patch_campaign(campaign_id: UUID, payload: CampaignPatchRequest):
+    # Omitted and null fields are left alone; with nothing to change, skip the write.
+    changes = payload.model_dump(exclude_unset=True, exclude_none=True)
+    if not changes:
+        return (await _load_campaign(campaign_id))[0]
+    # values() turns each change into a bound parameter named after its column; the
+    # compiled form is cached per set of patched columns. updated_at is set through
+    # the column's onupdate.
+    stmt = update(campaigns).where(campaigns.c.id == campaign_id).values(**changes).returning(*_CAMPAIGN_COLS)
+    async with async_db_session() as db:
         try:
-            row = (
-                db.execute(
-                    q,
-                    {
-                        "id": str(campaign_id),
-                        "name": payload.name,
-                        "system": payload.system,
-                        "description": payload.description,
-                        "config": payload.config,
-                        "embedding_model": payload.embedding_model,
-                        "embedding_dim": payload.embedding_dim,
-                    },
-                )
-                .mappings()
-                .first()
-            )
+            result = await db.execute(stmt)
+            row = result.mappings().first()
             if not row:
-                db.rollback()
+                await db.rollback()
                 raise HTTPException(status_code=404, detail="Campaign not found.")
-            db.commit()
+            await db.commit()
         except IntegrityError:
-            db.rollback()
+            await db.rollback()
             raise HTTPException(status_code=409, detail="Update violates a uniqueness constraint.")
-    return dict(row)
+    return cache.put("campaign", campaign_id, dict(row))[0]
 
 
 @router.delete(
@@ -200,13 +721,11 @@ def patch_campaign(campaign_id: UUID, payload: CampaignPatchRequest):
     tags=["campaigns"],
     summary="Delete a campaign (may fail if FK constraints exist).",
 )
-def delete_campaign(campaign_id: UUID):
-    with db_session() as db:
-        row = db.execute(text("DELETE FROM campaigns WHERE id = :id RETURNING id"), {"id": str(campaign_id)}).scalar()
-        if not row:
-            db.rollback()
-            raise HTTPException(status_code=404, detail="Campaign not found.")
-        db.commit()
+async def delete_campaign(campaign_id: UUID):
+    if not await _delete_returning(_SQL_DELETE_CAMPAIGN, campaign_id):
+        raise HTTPException(status_code=404, detail="Campaign not found.")
+    # The delete cascades to workspaces, sources, runs and documents.
+    cache.clear()
     return None
 
 
@@ -221,36 +740,25 @@ def delete_campaign(campaign_id: UUID):
     tags=["workspaces"],
     summary="Create a workspace (chat topic) under a campaign.",
 )
-def create_workspace(payload: WorkspaceCreateRequest):
-    with db_session() as db:
-        exists = db.execute(text("SELECT 1 FROM campaigns WHERE id = :id"), {"id": str(payload.campaign_id)}).scalar()
-        if not exists:
-            raise HTTPException(status_code=404, detail="Campaign not found.")
-
+async def create_workspace(payload: WorkspaceCreateRequest):
+    async with async_db_session() as db:
         try:
-            row = (
-                db.execute(
-                    text(
-                        """
-                        INSERT INTO workspaces (campaign_id, name, purpose, state)
-                        VALUES (:campaign_id, :name, :purpose, :state::jsonb)
-                        RETURNING id, campaign_id, name, purpose, state
-                        """
-                    ),
-                    {
-                        "campaign_id": str(payload.campaign_id),
-                        "name": payload.name,
-                        "purpose": payload.purpose,
-                        "state": payload.state,
-                    },
-                )
-                .mappings()
-                .one()
+            result = await db.execute(
+                _SQL_INSERT_WORKSPACE,
+                {
+                    "campaign_id": payload.campaign_id,
+                    "name": payload.name,
+                    "purpose": payload.purpose,
+                    "state": payload.state,
+                },
             )
-            db.commit()
+            row = result.mappings().first()
+            await db.commit()
         except IntegrityError:
-            db.rollback()
+            await db.rollback()
             raise HTTPException(status_code=409, detail="Workspace name already exists for this campaign.")
+    if not row:
+        raise HTTPException(status_code=404, detail="Campaign not found.")
     return dict(row)
 
 
@@ -260,52 +768,19 @@ def create_workspace(payload: WorkspaceCreateRequest):
     tags=["workspaces"],
     summary="List workspaces (optionally filtered by campaign).",
 )
-def list_workspaces(
+async def list_workspaces(
     campaign_id: Optional[UUID] = Query(None),
     limit: int = Query(50, ge=1, le=500),
     offset: int = Query(0, ge=0),
 ):
-    with db_session() as db:
+    async with async_db_session() as db:
         if campaign_id:
-            total = db.execute(
-                text("SELECT count(*) FROM workspaces WHERE campaign_id = :cid"),
-                {"cid": str(campaign_id)},
-            ).scalar_one()
-            rows = (
-                db.execute(
-                    text(
-                        """
-                        SELECT id, campaign_id, name, purpose, state
-                        FROM workspaces
-                        WHERE campaign_id = :cid
-                        ORDER BY name
-                        LIMIT :limit OFFSET :offset
-                        """
-                    ),
-                    {"cid": str(campaign_id), "limit": limit, "offset": offset},
-                )
-                .mappings()
-                .all()
-            )
+            params = {"cid": campaign_id, "limit": limit, "offset": offset}
+            items, total = await _fetch_page(db, _SQL_LIST_WORKSPACES_BY_CID, _SQL_COUNT_WORKSPACES_BY_CID, params)
         else:
-            total = db.execute(text("SELECT count(*) FROM workspaces")).scalar_one()
-            rows = (
-                db.execute(
-                    text(
-                        """
-                        SELECT id, campaign_id, name, purpose, state
-                        FROM workspaces
-                        ORDER BY name
-                        LIMIT :limit OFFSET :offset
-                        """
-                    ),
-                    {"limit": limit, "offset": offset},
-                )
-                .mappings()
-                .all()
-            )
-
-    return {"items": [dict(r) for r in rows], "total": total, "limit": limit, "offset": offset}
+            params = {"limit": limit, "offset": offset}
+            items, total = await _fetch_page(db, _SQL_LIST_WORKSPACES, _SQL_COUNT_WORKSPACES, params)
+    return {"items": items, "total": total, "limit": limit, "offset": offset}
 
 
 @router.get(
@@ -314,25 +789,20 @@ def list_workspaces(
     tags=["workspaces"],
     summary="Get workspace by id.",
 )
-def get_workspace(workspace_id: UUID):
-    with db_session() as db:
-        row = (
-            db.execute(
-                text(
-                    """
-                    SELECT id, campaign_id, name, purpose, state
-                    FROM workspaces
-                    WHERE id = :id
-                    """
-                ),
-                {"id": str(workspace_id)},
-            )
-            .mappings()
-            .first()
-        )
-        if not row:
-            raise HTTPException(status_code=404, detail="Workspace not found.")
-    return dict(row)
+async def get_workspace(workspace_id: UUID, request: Request, response: Response):
+    return cache.respond(request, response, await _load_workspace(workspace_id))
+
+
+async def _load_workspace(workspace_id: UUID) -> cache.CacheEntry:
+    entry = cache.get("workspace", workspace_id)
+    if entry is None:
+        async with async_db_session() as db:
+            result = await db.execute(_SQL_GET_WORKSPACE, {"id": workspace_id})
+            row = result.mappings().first()
+            if not row:
+                raise HTTPException(status_code=404, detail="Workspace not found.")
+        entry = cache.put("workspace", workspace_id, dict(row))
+    return entry
 
 
 @router.patch(
@@ -341,36 +811,25 @@ def get_workspace(workspace_id: UUID):
     tags=["workspaces"],
     summary="Update workspace fields.",
 )
-def patch_workspace(workspace_id: UUID, payload: WorkspacePatchRequest):
-    q = text(
-        """
-        UPDATE workspaces
-        SET
-          name = COALESCE(:name, name),
-          purpose = COALESCE(:purpose, purpose),
-          state = COALESCE(:state::jsonb, state)
-        WHERE id = :id
-        RETURNING id, campaign_id, name, purpose, state
-        """
+async def patch_workspace(workspace_id: UUID, payload: WorkspacePatchRequest):
+    changes = payload.model_dump(exclude_unset=True, exclude_none=True)
+    if not changes:
+        return (await _load_workspace(workspace_id))[0]
+    stmt = _patch_sql(
+        "workspaces", tuple(sorted(changes)), "id, campaign_id, name, purpose, state", json_columns=("state",)
     )
-    with db_session() as db:
+    async with async_db_session() as db:
         try:
-            row = (
-                db.execute(
-                    q,
-                    {"id": str(workspace_id), "name": payload.name, "purpose": payload.purpose, "state": payload.state},
-                )
-                .mappings()
-                .first()
-            )
+            result = await db.execute(stmt, {"id": workspace_id, **changes})
+            row = result.mappings().first()
             if not row:
-                db.rollback()
+                await db.rollback()
                 raise HTTPException(status_code=404, detail="Workspace not found.")
-            db.commit()
+            await db.commit()
         except IntegrityError:
-            db.rollback()
+            await db.rollback()
             raise HTTPException(status_code=409, detail="Update violates a uniqueness constraint.")
-    return dict(row)
+    return cache.put("workspace", workspace_id, dict(row))[0]
 
 
 @router.delete(
@@ -379,13 +838,10 @@ def patch_workspace(workspace_id: UUID, payload: WorkspacePatchRequest):
     tags=["workspaces"],
     summary="Delete a workspace (may fail if FK constraints exist).",
 )
-def delete_workspace(workspace_id: UUID):
-    with db_session() as db:
-        row = db.execute(text("DELETE FROM workspaces WHERE id = :id RETURNING id"), {"id": str(workspace_id)}).scalar()
-        if not row:
-            db.rollback()
-            raise HTTPException(status_code=404, detail="Workspace not found.")
-        db.commit()
+async def delete_workspace(workspace_id: UUID):
+    if not await _delete_returning(_SQL_DELETE_WORKSPACE, workspace_id):
+        raise HTTPException(status_code=404, detail="Workspace not found.")
+    cache.invalidate("workspace", workspace_id)
     return None
 
 
@@ -400,48 +856,31 @@ def delete_workspace(workspace_id: UUID):
     tags=["sources"],
     summary="Create a source folder configuration for a campaign.",
 )
-def create_source(payload: SourceCreateRequest):
-    with db_session() as db:
-        exists = db.execute(text("SELECT 1 FROM campaigns WHERE id = :id"), {"id": str(payload.campaign_id)}).scalar()
-        if not exists:
-            raise HTTPException(status_code=404, detail="Campaign not found.")
+async def create_source(payload: SourceCreateRequest):
+    async with async_db_session() as db:
         try:
-            row = (
-                db.execute(
-                    text(
-                        """
-                        INSERT INTO campaign_sources (
-                          campaign_id, name, kind, root_path, recursive, follow_symlinks,
-                          include_globs, exclude_globs, change_detection, enabled
-                        )
-                        VALUES (
-                          :campaign_id, :name, :kind, :root_path, :recursive, :follow_symlinks,
-                          :include_globs::jsonb, :exclude_globs::jsonb, :change_detection, :enabled
-                        )
-                        RETURNING id, campaign_id, name, kind, root_path, recursive, follow_symlinks,
-                                  include_globs, exclude_globs, change_detection, enabled, last_scan_at, last_ingest_at
-                        """
-                    ),
-                    {
-                        "campaign_id": str(payload.campaign_id),
-                        "name": payload.name,
-                        "kind": payload.kind,
-                        "root_path": payload.root_path,
-                        "recursive": payload.recursive,
-                        "follow_symlinks": payload.follow_symlinks,
-                        "include_globs": payload.include_globs,
-                        "exclude_globs": payload.exclude_globs,
-                        "change_detection": payload.change_detection,
-                        "enabled": payload.enabled,
-                    },
-                )
-                .mappings()
-                .one()
+            result = await db.execute(
+                _SQL_INSERT_SOURCE,
+                {
+                    "campaign_id": payload.campaign_id,
+                    "name": payload.name,
+                    "kind": payload.kind,
+                    "root_path": payload.root_path,
+                    "recursive": payload.recursive,
+                    "follow_symlinks": payload.follow_symlinks,
+                    "include_globs": payload.include_globs,
+                    "exclude_globs": payload.exclude_globs,
+                    "change_detection": payload.change_detection,
+                    "enabled": payload.enabled,
+                },
             )
-            db.commit()
+            row = result.mappings().first()
+            await db.commit()
         except IntegrityError:
-            db.rollback()
+            await db.rollback()
             raise HTTPException(status_code=409, detail="Source name already exists for this campaign.")
+    if not row:
+        raise HTTPException(status_code=404, detail="Campaign not found.")
     return dict(row)
 
 
@@ -451,53 +890,19 @@ def create_source(payload: SourceCreateRequest):
     tags=["sources"],
     summary="List sources (optionally filtered by campaign).",
 )
-def list_sources(
+async def list_sources(
     campaign_id: Optional[UUID] = Query(None),
     limit: int = Query(200, ge=1, le=500),
     offset: int = Query(0, ge=0),
 ):
-    with db_session() as db:
+    async with async_db_session() as db:
         if campaign_id:
-            total = db.execute(
-                text("SELECT count(*) FROM campaign_sources WHERE campaign_id = :cid"),
-                {"cid": str(campaign_id)},
-            ).scalar_one()
-            rows = (
-                db.execute(
-                    text(
-                        """
-                        SELECT id, campaign_id, name, kind, root_path, recursive, follow_symlinks,
-                               include_globs, exclude_globs, change_detection, enabled, last_scan_at, last_ingest_at
-                        FROM campaign_sources
-                        WHERE campaign_id = :cid
-                        ORDER BY name
-                        LIMIT :limit OFFSET :offset
-                        """
-                    ),
-                    {"cid": str(campaign_id), "limit": limit, "offset": offset},
-                )
-                .mappings()
-                .all()
-            )
+            params = {"cid": campaign_id, "limit": limit, "offset": offset}
+            items, total = await _fetch_page(db, _SQL_LIST_SOURCES_BY_CID, _SQL_COUNT_SOURCES_BY_CID, params)
         else:
-            total = db.execute(text("SELECT count(*) FROM campaign_sources")).scalar_one()
-            rows = (
-                db.execute(
-                    text(
-                        """
-                        SELECT id, campaign_id, name, kind, root_path, recursive, follow_symlinks,
-                               include_globs, exclude_globs, change_detection, enabled, last_scan_at, last_ingest_at
-                        FROM campaign_sources
-                        ORDER BY name
-                        LIMIT :limit OFFSET :offset
-                        """
-                    ),
-                    {"limit": limit, "offset": offset},
-                )
-                .mappings()
-                .all()
-            )
-    return {"items": [dict(r) for r in rows], "total": total, "limit": limit, "offset": offset}
+            params = {"limit": limit, "offset": offset}
+            items, total = await _fetch_page(db, _SQL_LIST_SOURCES, _SQL_COUNT_SOURCES, params)
+    return {"items": items, "total": total, "limit": limit, "offset": offset}
 
 
 @router.get(
@@ -506,26 +911,20 @@ def list_sources(
     tags=["sources"],
     summary="Get source by id.",
 )
-def get_source(source_id: UUID):
-    with db_session() as db:
-        row = (
-            db.execute(
-                text(
-                    """
-                    SELECT id, campaign_id, name, kind, root_path, recursive, follow_symlinks,
-                           include_globs, exclude_globs, change_detection, enabled, last_scan_at, last_ingest_at
-                    FROM campaign_sources
-                    WHERE id = :id
-                    """
-                ),
-                {"id": str(source_id)},
-            )
-            .mappings()
-            .first()
-        )
-        if not row:
-            raise HTTPException(status_code=404, detail="Source not found.")
-    return dict(row)
+async def get_source(source_id: UUID, request: Request, response: Response):
+    return cache.respond(request, response, await _load_source(source_id))
+
+
+async def _load_source(source_id: UUID) -> cache.CacheEntry:
+    entry = cache.get("source", source_id)
+    if entry is None:
+        async with async_db_session() as db:
+            result = await db.execute(_SQL_GET_SOURCE, {"id": source_id})
+            row = result.mappings().first()
+            if not row:
+                raise HTTPException(status_code=404, detail="Source not found.")
+        entry = cache.put("source", source_id, dict(row))
+    return entry
 
 
 @router.patch(
@@ -534,54 +933,23 @@ def get_source(source_id: UUID):
     tags=["sources"],
     summary="Update a source configuration.",
 )
-def patch_source(source_id: UUID, payload: SourcePatchRequest):
-    q = text(
-        """
-        UPDATE campaign_sources
-        SET
-          name = COALESCE(:name, name),
-          kind = COALESCE(:kind, kind),
-          root_path = COALESCE(:root_path, root_path),
-          recursive = COALESCE(:recursive, recursive),
-          follow_symlinks = COALESCE(:follow_symlinks, follow_symlinks),
-          include_globs = COALESCE(:include_globs::jsonb, include_globs),
-          exclude_globs = COALESCE(:exclude_globs::jsonb, exclude_globs),
-          change_detection = COALESCE(:change_detection, change_detection),
-          enabled = COALESCE(:enabled, enabled)
-        WHERE id = :id
-        RETURNING id, campaign_id, name, kind, root_path, recursive, follow_symlinks,
-                  include_globs, exclude_globs, change_detection, enabled, last_scan_at, last_ingest_at
-        """
-    )
-    with db_session() as db:
+async def patch_source(source_id: UUID, payload: SourcePatchRequest):
+    changes = payload.model_dump(exclude_unset=True, exclude_none=True)
+    if not changes:
+        return (await _load_source(source_id))[0]
+    stmt = _patch_sql("campaign_sources", tuple(sorted(changes)), _SOURCE_COLS)
+    async with async_db_session() as db:
         try:
-            row = (
-                db.execute(
-                    q,
-                    {
-                        "id": str(source_id),
-                        "name": payload.name,
-                        "kind": payload.kind,
-                        "root_path": payload.root_path,
-                        "recursive": payload.recursive,
-                        "follow_symlinks": payload.follow_symlinks,
-                        "include_globs": payload.include_globs,
-                        "exclude_globs": payload.exclude_globs,
-                        "change_detection": payload.change_detection,
-                        "enabled": payload.enabled,
-                    },
-                )
-                .mappings()
-                .first()
-            )
+            result = await db.execute(stmt, {"id": source_id, **changes})
+            row = result.mappings().first()
             if not row:
-                db.rollback()
+                await db.rollback()
                 raise HTTPException(status_code=404, detail="Source not found.")
-            db.commit()
+            await db.commit()
         except IntegrityError:
-            db.rollback()
+            await db.rollback()
             raise HTTPException(status_code=409, detail="Update violates a uniqueness constraint.")
-    return dict(row)
+    return cache.put("source", source_id, dict(row))[0]
 
 
 @router.delete(
@@ -590,13 +958,13 @@ def patch_source(source_id: UUID, payload: SourcePatchRequest):
     tags=["sources"],
     summary="Delete a source configuration (may fail if FK constraints exist).",
 )
-def delete_source(source_id: UUID):
-    with db_session() as db:
-        row = db.execute(text("DELETE FROM campaign_sources WHERE id = :id RETURNING id"), {"id": str(source_id)}).scalar()
-        if not row:
-            db.rollback()
-            raise HTTPException(status_code=404, detail="Source not found.")
-        db.commit()
+async def delete_source(source_id: UUID):
+    if not await _delete_returning(_SQL_DELETE_SOURCE, source_id):
+        raise HTTPException(status_code=404, detail="Source not found.")
+    cache.invalidate("source", source_id)
+    # Documents of the source's files lose their source_file_id.
+    cache.invalidate_kind("document")
+    cache.clear_counts()
     return None
 
 
@@ -606,23 +974,10 @@ def delete_source(source_id: UUID):
     tags=["sources"],
     summary="List folders discovered for a source (from last scans).",
 )
-def list_source_folders(source_id: UUID):
-    with db_session() as db:
-        rows = (
-            db.execute(
-                text(
-                    """
-                    SELECT id, source_id, rel_path, parent_id, depth, last_seen_at
-                    FROM source_folders
-                    WHERE source_id = :sid
-                    ORDER BY depth, rel_path
-                    """
-                ),
-                {"sid": str(source_id)},
-            )
-            .mappings()
-            .all()
-        )
+async def list_source_folders(source_id: UUID):
+    async with async_db_session() as db:
+        result = await db.execute(_SQL_LIST_SOURCE_FOLDERS, {"sid": source_id})
+        rows = result.mappings().all()
     return [dict(r) for r in rows]
 
 
@@ -632,71 +987,110 @@ def list_source_folders(source_id: UUID):
     tags=["sources"],
     summary="List files discovered for a source (with ingest status).",
 )
-def list_source_files(
+async def list_source_files(
     source_id: UUID,
     status_filter: Optional[str] = Query(None, description="Filter by status: seen|deleted|..."),
     ingest_status: Optional[str] = Query(None, description="Filter by last_ingest_status: ok|error|skipped|never"),
-    q: Optional[str] = Query(None, description="Substring match on rel_path."),
+    q: Optional[str] = Query(
+        None, min_length=_Q_MIN_LENGTH, max_length=_Q_MAX_LENGTH, description="Substring match on rel_path."
+    ),
     limit: int = Query(200, ge=1, le=1000),
-    offset: int = Query(0, ge=0),
+    offset: int = Query(0, ge=0, description="Slow on deep pages; prefer cursor."),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page (ignores offset)."),
+    exact_count: bool = Query(False, description="Count matching rows exactly (slower) instead of a cached estimate."),
 ):
-    where = ["source_id = :sid"]
-    params = {"sid": str(source_id), "limit": limit, "offset": offset}
+    filters = []
+    params = {"sid": source_id, "limit": limit, "offset": offset}
+    if cursor:
+        params.update(_decode_cursor(cursor))
     if status_filter:
-        where.append("status = :status")
+        filters.append("status")
         params["status"] = status_filter
     if ingest_status:
-        where.append("last_ingest_status = :lst")
+        filters.append("lst")
         params["lst"] = ingest_status
     if q:
-        where.append("rel_path ILIKE :q")
-        params["q"] = f"%{q}%"
-
-    where_sql = " AND ".join(where)
-    with db_session() as db:
-        total = db.execute(text(f"SELECT count(*) FROM source_files WHERE {where_sql}"), params).scalar_one()
-        rows = (
-            db.execute(
-                text(
-                    f"""
-                    SELECT id, source_id, folder_id, rel_path, ext, size_bytes, mtime_epoch, sha256,
-                           status, last_seen_at, last_ingested_at, last_ingest_status, error
-                    FROM source_files
-                    WHERE {where_sql}
-                    ORDER BY rel_path
-                    LIMIT :limit OFFSET :offset
-                    """
-                ),
-                params,
-            )
-            .mappings()
-            .all()
-        )
-    return {"items": [dict(r) for r in rows], "total": total, "limit": limit, "offset": offset}
+        filters.append("q")
+        params["q"] = _like_pattern(q)
+
+    count_sql, page_sql = _source_files_sql(tuple(filters), bool(cursor), exact_count)
+    # Up to 1000 rows: stream them out rather than building the whole page in memory.
+    return StreamingResponse(
+        _stream_page(
+            page_sql,
+            count_sql,
+            params,
+            {"limit": limit, "offset": offset},
+            next_cursor=lambda r: _encode_cursor(r["rel_path"], r["id"]),
+        ),
+        media_type="application/json",
+    )
 
 
 # ----------------------------
 # KB update
 # ----------------------------
 
+async def _run_kb_update(**kwargs: Any) -> None:
+    """Background body of a queued kb_update; failures are recorded on the run row."""
+    try:
+        await kb_worker.run_update(**kwargs)
+    finally:
+        cache.invalidate_kind("source")
+        cache.invalidate_kind("document")
+        cache.clear_counts()
+
+
 @router.post(
     "/kb/update",
     response_model=KBUpdateResponse,
-    status_code=status.HTTP_200_OK,
+    status_code=status.HTTP_202_ACCEPTED,
     tags=["kb"],
-    summary="Scan configured sources, detect changes, and ingest updated files into the campaign KB.",
+    summary="Queue a scan of the configured sources; poll /ingest/runs/{ingest_run_id} for progress.",
 )
-def kb_update(payload: KBUpdateRequest):
+async def kb_update(
+    payload: KBUpdateRequest,
+    background_tasks: BackgroundTasks,
+    response: Response,
+    sync: bool = Query(False, include_in_schema=False),
+):
+    # sync=true runs the whole scan within the request, holding it and a scan worker
+    # for as long as it takes: a test/debugging aid, refused in production.
+    if sync and settings.app_env == "prod":
+        raise HTTPException(status_code=400, detail="sync is not available in production.")
+    if not sync:
+        async with async_db_session() as db:
+            run_id = (await db.execute(_SQL_QUEUE_INGEST_RUN, {"cid": payload.campaign_id})).scalar()
+            if run_id is None:
+                raise HTTPException(status_code=400, detail="Campaign not found.")
+            await db.commit()
+        cache.clear_counts()
+        background_tasks.add_task(
+            _run_kb_update,
+            campaign_id=str(payload.campaign_id),
+            dry_run=payload.dry_run,
+            force_rehash=payload.force_rehash,
+            max_files=payload.max_files,
+            ingest_run_id=str(run_id),
+        )
+        return {"ingest_run_id": run_id, "status": "queued"}
+
+    response.status_code = status.HTTP_200_OK
     try:
-        result = update_campaign_kb(
+        # The scan is sync (psycopg + filesystem); keep it off the event loop.
+        result = await kb_worker.run_update(
             campaign_id=str(payload.campaign_id),
             dry_run=payload.dry_run,
             force_rehash=payload.force_rehash,
             max_files=payload.max_files,
         )
-        return result
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    # The scan stamps sources and rewrites documents.
+    cache.invalidate_kind("source")
+    cache.invalidate_kind("document")
+    cache.clear_counts()
+    return result
 
 
 # ----------------------------
@@ -709,51 +1103,26 @@ def kb_update(payload: KBUpdateRequest):
     tags=["ingest"],
     summary="List ingestion runs (optionally by campaign).",
 )
-def list_ingest_runs(
+async def list_ingest_runs(
     campaign_id: Optional[UUID] = Query(None),
     limit: int = Query(50, ge=1, le=500),
-    offset: int = Query(0, ge=0),
+    offset: int = Query(0, ge=0, description="Slow on deep pages; prefer cursor."),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page (ignores offset)."),
+    exact_count: bool = Query(False, description="Count matching rows exactly (slower) instead of a cached estimate."),
 ):
-    with db_session() as db:
-        if campaign_id:
-            total = db.execute(
-                text("SELECT count(*) FROM ingest_runs WHERE campaign_id = :cid"),
-                {"cid": str(campaign_id)},
-            ).scalar_one()
-            rows = (
-                db.execute(
-                    text(
-                        """
-                        SELECT id, campaign_id, trigger, status, started_at, finished_at, stats, error
-                        FROM ingest_runs
-                        WHERE campaign_id = :cid
-                        ORDER BY started_at DESC NULLS LAST, id DESC
-                        LIMIT :limit OFFSET :offset
-                        """
-                    ),
-                    {"cid": str(campaign_id), "limit": limit, "offset": offset},
-                )
-                .mappings()
-                .all()
-            )
-        else:
-            total = db.execute(text("SELECT count(*) FROM ingest_runs")).scalar_one()
-            rows = (
-                db.execute(
-                    text(
-                        """
-                        SELECT id, campaign_id, trigger, status, started_at, finished_at, stats, error
-                        FROM ingest_runs
-                        ORDER BY started_at DESC NULLS LAST, id DESC
-                        LIMIT :limit OFFSET :offset
-                        """
-                    ),
-                    {"limit": limit, "offset": offset},
-                )
-                .mappings()
-                .all()
-            )
-    return {"items": [dict(r) for r in rows], "total": total, "limit": limit, "offset": offset}
+    filters = []
+    params = {"limit": limit, "offset": offset}
+    if campaign_id:
+        filters.append("cid")
+        params["cid"] = campaign_id
+    if cursor:
+        params.update(_decode_cursor(cursor, key_is_datetime=True))
+
+    count_sql, page_sql = _ingest_runs_sql(tuple(filters), bool(cursor), exact_count)
+    async with async_db_session() as db:
+        items, total = await _fetch_page(db, page_sql, count_sql, params)
+    next_cursor = _encode_cursor(items[-1]["started_at"], items[-1]["id"]) if len(items) == limit else None
+    return {"items": items, "total": total, "limit": limit, "offset": offset, "next_cursor": next_cursor}
 
 
 @router.get(
@@ -762,25 +1131,20 @@ def list_ingest_runs(
     tags=["ingest"],
     summary="Get ingestion run details.",
 )
-def get_ingest_run(run_id: UUID):
-    with db_session() as db:
-        row = (
-            db.execute(
-                text(
-                    """
-                    SELECT id, campaign_id, trigger, status, started_at, finished_at, stats, error
-                    FROM ingest_runs
-                    WHERE id = :id
-                    """
-                ),
-                {"id": str(run_id)},
-            )
-            .mappings()
-            .first()
-        )
-        if not row:
-            raise HTTPException(status_code=404, detail="Ingest run not found.")
-    return dict(row)
+async def get_ingest_run(run_id: UUID, request: Request, response: Response):
+    entry = cache.get("ingest_run", run_id)
+    if entry is None:
+        async with async_db_session() as db:
+            result = await db.execute(_SQL_GET_INGEST_RUN, {"id": run_id})
+            row = result.mappings().first()
+            if not row:
+                raise HTTPException(status_code=404, detail="Ingest run not found.")
+        # A run still queued or in progress changes under us; only finished runs are cacheable.
+        if row["status"] in ("queued", "running"):
+            entry = cache.entry_for(dict(row))
+        else:
+            entry = cache.put("ingest_run", run_id, dict(row))
+    return cache.respond(request, response, entry)
 
 
 @router.get(
@@ -789,23 +1153,10 @@ def get_ingest_run(run_id: UUID):
     tags=["ingest"],
     summary="List per-file actions for an ingestion run.",
 )
-def list_ingest_run_files(run_id: UUID):
-    with db_session() as db:
-        rows = (
-            db.execute(
-                text(
-                    """
-                    SELECT ingest_run_id, source_file_id, action, status, reason, error
-                    FROM ingest_run_files
-                    WHERE ingest_run_id = :id
-                    ORDER BY source_file_id
-                    """
-                ),
-                {"id": str(run_id)},
-            )
-            .mappings()
-            .all()
-        )
+async def list_ingest_run_files(run_id: UUID):
+    async with async_db_session() as db:
+        result = await db.execute(_SQL_LIST_INGEST_RUN_FILES, {"id": run_id})
+        rows = result.mappings().all()
     return [dict(r) for r in rows]
 
 
@@ -819,47 +1170,113 @@ def list_ingest_run_files(run_id: UUID):
     tags=["kb"],
     summary="List documents in the campaign KB (basic filtering).",
 )
-def list_documents(
+async def list_documents(
     campaign_id: UUID = Query(...),
     doc_type: Optional[str] = Query(None),
-    q: Optional[str] = Query(None, description="Substring match on title/body."),
+    q: Optional[str] = Query(
+        None, min_length=_Q_MIN_LENGTH, max_length=_Q_MAX_LENGTH, description="Substring match on title/body."
+    ),
     limit: int = Query(50, ge=1, le=500),
-    offset: int = Query(0, ge=0),
+    offset: int = Query(0, ge=0, description="Slow on deep pages; prefer cursor."),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page (ignores offset)."),
+    exact_count: bool = Query(False, description="Count matching rows exactly (slower) instead of a cached estimate."),
     include_body: bool = Query(False, description="If true, include body_md in results (heavier)."),
+    fields: Optional[str] = Query(
+        None, description="Comma-separated columns to return (id and updated_at are always included)."
+    ),
 ):
-    where = ["campaign_id = :cid"]
-    params = {"cid": str(campaign_id), "limit": limit, "offset": offset}
+    filters = []
+    params = {"cid": campaign_id, "limit": limit, "offset": offset}
+    if cursor:
+        params.update(_decode_cursor(cursor, key_is_datetime=True))
     if doc_type:
-        where.append("doc_type = :dt")
+        filters.append("dt")
         params["dt"] = doc_type
     if q:
-        where.append("(title ILIKE :q OR body_md ILIKE :q)")
-        params["q"] = f"%{q}%"
-    where_sql = " AND ".join(where)
+        filters.append("q")
+        params["q"] = _like_pattern(q)
 
-    cols = "id, campaign_id, source_file_id, doc_type, title, content_hash, created_at, updated_at"
-    if include_body:
-        cols = "id, campaign_id, source_file_id, doc_type, title, body_md, content_hash, created_at, updated_at"
-
-    with db_session() as db:
-        total = db.execute(text(f"SELECT count(*) FROM kb_documents WHERE {where_sql}"), params).scalar_one()
-        rows = (
-            db.execute(
-                text(
-                    f"""
-                    SELECT {cols}
-                    FROM kb_documents
-                    WHERE {where_sql}
-                    ORDER BY updated_at DESC NULLS LAST, id DESC
-                    LIMIT :limit OFFSET :offset
-                    """
-                ),
-                params,
-            )
-            .mappings()
-            .all()
-        )
-    return {"items": [dict(r) for r in rows], "total": total, "limit": limit, "offset": offset}
+    count_sql, page_sql = _documents_sql(
+        tuple(filters), _document_fields(fields, include_body), bool(cursor), exact_count
+    )
+    async with async_db_session() as db:
+        items, total = await _fetch_page(db, page_sql, count_sql, params)
+    next_cursor = _encode_cursor(items[-1]["updated_at"], items[-1]["id"]) if len(items) == limit else None
+    # Rows already have the response shape: skip response_model validation on this hot path.
+    return ORJSONResponse(
+        {"items": items, "total": total, "limit": limit, "offset": offset, "next_cursor": next_cursor}
+    )
+
+
+@router.post(
+    "/kb/documents:bulk",
+    response_model=DocumentBulkCreateResponse,
+    status_code=status.HTTP_201_CREATED,
+    tags=["kb"],
+    summary="Create many documents in one transaction.",
+)
+async def bulk_create_documents(payload: DocumentBulkCreateRequest):
+    """Insert all documents or none.
+
+    Ids are generated here so both write paths can report them without RETURNING:
+    small batches go out as batched multi-row INSERTs, large ones through COPY. A
+    constraint violation rolls the whole batch back and answers 409 with the
+    indexes of the offending items.
+    """
+    rows = [{"id": uuid4(), **item.model_dump()} for item in payload.items]
+    async with async_db_session() as db:
+        try:
+            if len(rows) > _COPY_THRESHOLD:
+                conn = await db.connection()
+                raw = (await conn.get_raw_connection()).driver_connection
+                # The adapter only sends BEGIN with its first statement, which COPY on
+                # the driver connection bypasses: the transaction is opened here.
+                async with raw.transaction():
+                    await raw.copy_records_to_table(
+                        "kb_documents",
+                        columns=_DOCUMENT_COPY_COLS,
+                        records=[
+                            tuple(
+                                orjson.dumps(r[c]).decode() if c == "frontmatter" else r[c]
+                                for c in _DOCUMENT_COPY_COLS
+                            )
+                            for r in rows
+                        ],
+                    )
+            else:
+                await db.execute(insert(kb_documents), rows)
+            await db.commit()
+        except IntegrityError as e:
+            await db.rollback()
+            raise HTTPException(status_code=409, detail=_violating_rows(e.orig.__cause__ or e.orig, rows))
+        except asyncpg.IntegrityConstraintViolationError as e:
+            await db.rollback()
+            raise HTTPException(status_code=409, detail=_violating_rows(e, rows))
+    cache.clear_counts()
+    return {"ids": [r["id"] for r in rows], "inserted": len(rows)}
+
+
+@router.get(
+    "/kb/documents/chunks",
+    response_model=Dict[UUID, List[ChunkResponse]],
+    tags=["kb"],
+    summary="List chunks for several documents at once, keyed by document id.",
+)
+async def list_chunks_for_documents(
+    doc_ids: List[UUID] = Query(..., min_length=1, max_length=100, description="Repeat `doc_ids` per document."),
+):
+    """Load the chunks of a page of documents in one query.
+
+    Prefer this to calling `/kb/documents/{doc_id}/chunks` once per document. Unknown
+    ids map to an empty list.
+    """
+    async with async_db_session() as db:
+        result = await db.execute(_SQL_LIST_CHUNKS_BULK, {"ids": doc_ids})
+        rows = result.mappings().all()
+    by_doc: Dict[UUID, List[Dict[str, Any]]] = {d: [] for d in doc_ids}
+    for doc_id, chunks in itertools.groupby(rows, key=lambda r: r["document_id"]):
+        by_doc[doc_id] = [dict(r) for r in chunks]
+    return by_doc
 
 
 @router.get(
@@ -868,25 +1285,44 @@ def list_documents(
     tags=["kb"],
     summary="Get a document (includes body).",
 )
-def get_document(doc_id: UUID):
-    with db_session() as db:
-        row = (
-            db.execute(
-                text(
-                    """
-                    SELECT id, campaign_id, source_file_id, doc_type, title, body_md, content_hash, created_at, updated_at
-                    FROM kb_documents
-                    WHERE id = :id
-                    """
-                ),
-                {"id": str(doc_id)},
-            )
-            .mappings()
-            .first()
-        )
-        if not row:
+async def get_document(
+    doc_id: UUID,
+    request: Request,
+    response: Response,
+    fields: Optional[str] = Query(
+        None, description="Comma-separated columns to return, e.g. `title,doc_type` to skip the body."
+    ),
+):
+    if fields:
+        return await _get_document_fields(doc_id, _document_fields(fields), request, response)
+    entry = cache.get("document", doc_id)
+    if entry is None:
+        async with async_db_session() as db:
+            result = await db.execute(_SQL_GET_DOCUMENT, {"id": doc_id})
+            row = result.mappings().first()
+            if not row:
+                raise HTTPException(status_code=404, detail="Document not found.")
+        entry = cache.put("document", doc_id, dict(row))
+    return cache.respond(request, response, entry)
+
+
+async def _get_document_fields(doc_id: UUID, cols: Tuple[str, ...], request: Request, response: Response) -> Response:
+    """Partial document: projected from the cached row when there is one, else
+    selected column by column (and not cached). Bypasses the full response_model."""
+    entry = cache.get("document", doc_id)
+    if entry is not None:
+        row = {c: entry[0][c] for c in cols}
+    else:
+        async with async_db_session() as db:
+            found = (await db.execute(_document_projection_sql(cols), {"id": doc_id})).mappings().first()
+        if not found:
             raise HTTPException(status_code=404, detail="Document not found.")
-    return dict(row)
+        row = dict(found)
+    entry = cache.entry_for(row)
+    result = cache.respond(request, response, entry)
+    if isinstance(result, Response):
+        return result
+    return ORJSONResponse(result, headers={"ETag": entry[1]})
 
 
 @router.get(
@@ -895,31 +1331,35 @@ def get_document(doc_id: UUID):
     tags=["kb"],
     summary="List chunks for a document.",
 )
-def list_document_chunks(
+async def list_document_chunks(
     doc_id: UUID,
     limit: int = Query(200, ge=1, le=2000),
-    offset: int = Query(0, ge=0),
+    offset: int = Query(0, ge=0, deprecated=True, description="Slow on deep pages; use after_chunk_index."),
+    after_chunk_index: Optional[int] = Query(
+        None, ge=-1, description="next_cursor of the previous page (ignores offset)."
+    ),
 ):
-    with db_session() as db:
-        # verify doc exists and get campaign_id for response consistency
-        doc = db.execute(text("SELECT campaign_id FROM kb_documents WHERE id = :id"), {"id": str(doc_id)}).scalar()
-        if not doc:
-            raise HTTPException(status_code=404, detail="Document not found.")
-        total = db.execute(text("SELECT count(*) FROM kb_chunks WHERE document_id = :id"), {"id": str(doc_id)}).scalar_one()
-        rows = (
-            db.execute(
-                text(
-                    """
-                    SELECT id, campaign_id, document_id, section_path, chunk_index, content, metadata
-                    FROM kb_chunks
-                    WHERE document_id = :id
-                    ORDER BY chunk_index
-                    LIMIT :limit OFFSET :offset
-                    """
-                ),
-                {"id": str(doc_id), "limit": limit, "offset": offset},
-            )
-            .mappings()
-            .all()
-        )
-    return {"items": [dict(r) for r in rows], "total": total, "limit": limit, "offset": offset}
+    # The page and its total come from one windowed query; the existence check is
+    # skipped too when the document is in the row cache.
+    if cache.get("document", doc_id) is None:
+        async with async_db_session() as db:
+            # verify doc exists and get campaign_id for response consistency
+            doc = (await db.execute(_SQL_DOCUMENT_CAMPAIGN, {"id": doc_id})).scalar()
+            if not doc:
+                raise HTTPException(status_code=404, detail="Document not found.")
+    params = {"id": doc_id, "limit": limit, "offset": offset}
+    page_sql = _SQL_LIST_CHUNKS
+    if after_chunk_index is not None:
+        params["cur_key"] = after_chunk_index
+        page_sql = _SQL_LIST_CHUNKS_AFTER
+    # Up to 2000 rows: stream them out rather than building the whole page in memory.
+    return StreamingResponse(
+        _stream_page(
+            page_sql,
+            _SQL_COUNT_CHUNKS,
+            params,
+            {"limit": limit, "offset": offset},
+            next_cursor=lambda r: r["chunk_index"],
+        ),
+        media_type="application/json",
+    )
@@ -91,7 +91,13 @@ class SourceCreateRequest(BaseModel):
     follow_symlinks: bool = False
     include_globs: List[str] = Field(default_factory=list, description="POSIX globs, evaluated on relative path.")
     exclude_globs: List[str] = Field(default_factory=list)
-    change_detection: str = Field(default="auto", description="mtime|sha256|auto")
+    change_detection: str = Field(
+        default="auto",
+        description=(
+            "mtime_size: compare mtime+size only; sha256: hash every file on every scan; "
+            "auto: trust a matching mtime+size, hash only when they differ."
+        ),
+    )
     enabled: bool = True
 
 
@@ -160,6 +166,7 @@ class SourceFileListResponse(BaseModel):
     total: int
     limit: int
     offset: int
+    next_cursor: Optional[str] = Field(None, description="Pass as `cursor` to fetch the next page.")
 
 
 # ----------------------------
@@ -175,8 +182,8 @@ class KBUpdateRequest(BaseModel):
 
 class KBUpdateResponse(BaseModel):
     ingest_run_id: UUID
-    status: str
-    stats: Dict[str, Any]
+    status: str = Field(..., description="queued|ok|partial")
+    stats: Optional[Dict[str, Any]] = Field(None, description="Set once the run has finished (sync=true).")
 
 
 class IngestRunResponse(BaseModel):
@@ -195,6 +202,7 @@ class IngestRunListResponse(BaseModel):
     total: int
     limit: int
     offset: int
+    next_cursor: Optional[str] = Field(None, description="Pass as `cursor` to fetch the next page.")
 
 
 class IngestRunFileResponse(BaseModel):
@@ -227,6 +235,28 @@ class DocumentListResponse(BaseModel):
     total: int
     limit: int
     offset: int
+    next_cursor: Optional[str] = Field(None, description="Pass as `cursor` to fetch the next page.")
+
+
+class DocumentCreateRequest(BaseModel):
+    campaign_id: UUID
+    source_file_id: Optional[UUID] = None
+    workspace_id: Optional[UUID] = None
+    doc_type: str = Field(..., min_length=1, description="npc|pc|session|location|plot|faction|item|memory|...")
+    title: str = Field(..., min_length=1)
+    canonical_name: Optional[str] = None
+    frontmatter: Dict[str, Any] = Field(default_factory=dict)
+    body_md: Optional[str] = None
+    content_hash: Optional[str] = None
+
+
+class DocumentBulkCreateRequest(BaseModel):
+    items: List[DocumentCreateRequest] = Field(..., min_length=1, max_length=50000)
+
+
+class DocumentBulkCreateResponse(BaseModel):
+    ids: List[UUID] = Field(..., description="Ids of the created documents, in request order.")
+    inserted: int
 
 
 class ChunkResponse(BaseModel):
@@ -244,3 +274,4 @@ class ChunkListResponse(BaseModel):
     total: int
     limit: int
     offset: int
+    next_cursor: Optional[int] = Field(None, description="Pass as `after_chunk_index` to fetch the next page.")
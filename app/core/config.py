@@ -4,9 +4,30 @@ class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
     database_url: str = "postgresql+psycopg://rpg:rpg@db:5432/rpgkb"
+    # asyncpg URL used by the API handlers; derived from database_url when unset.
+    async_database_url: str | None = None
     # Ollama runs on the host (outside docker). In compose, set to http://host.docker.internal:11434
     ollama_base_url: str = "http://host.docker.internal:11434"
 
+    # Connection pool sizing, shared by the sync and async engines (per process).
+    # Keep db_pool_size + db_max_overflow >= concurrent DB calls a worker is expected
+    # to hold, and uvicorn workers x (pool_size + max_overflow) below Postgres
+    # max_connections.
+    db_pool_size: int = 20
+    db_max_overflow: int = 10
+    db_pool_timeout: int = 30
+    db_pool_recycle: int = 3600
+    # Set when running behind PgBouncer in transaction mode: let PgBouncer pool.
+    db_null_pool: bool = False
+    # Per-connection prepared statement caches on the asyncpg side (asyncpg's own and
+    # SQLAlchemy's adapter). Big enough for every distinct API statement; set to 0
+    # behind PgBouncer in transaction mode, where server-side statements don't survive.
+    db_statement_cache_size: int = 1024
+
+    # KB scans run concurrently per process (each holds one sync DB connection);
+    # further queued runs wait for a free slot.
+    kb_update_workers: int = 2
+
     app_env: str = "dev"
 
 settings = Settings()
@@ -1,12 +1,67 @@
-from contextlib import contextmanager
+from contextlib import asynccontextmanager, contextmanager
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 from app.core.config import settings
 
-engine = create_engine(settings.database_url, pool_pre_ping=True)
+if settings.db_null_pool:
+    _pool_kwargs = {"poolclass": NullPool}
+else:
+    _pool_kwargs = {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+    }
+
+engine = create_engine(settings.database_url, pool_pre_ping=True, **_pool_kwargs)
 
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
+# The API handlers run on the event loop through asyncpg; the KB ingest keeps the
+# sync psycopg engine above. Derive the async URL from DATABASE_URL unless set.
+async_database_url = settings.async_database_url or make_url(settings.database_url).set(
+    drivername="postgresql+asyncpg"
+)
+
+async_engine = create_async_engine(
+    async_database_url,
+    pool_pre_ping=True,
+    connect_args={
+        "statement_cache_size": settings.db_statement_cache_size,
+        "prepared_statement_cache_size": settings.db_statement_cache_size,
+    },
+    **_pool_kwargs,
+)
+
+AsyncSessionLocal = sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+# Same pool, but each statement commits on its own: for handlers that issue a single
+# write and would otherwise pay a separate BEGIN and COMMIT round-trip around it.
+AsyncAutocommitSessionLocal = sessionmaker(
+    bind=async_engine.execution_options(isolation_level="AUTOCOMMIT"),
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+async def get_async_db():
+    """FastAPI dependency: one AsyncSession per request, for async handlers."""
+    async with async_db_session() as db:
+        yield db
+
+async def get_async_autocommit_db():
+    """FastAPI dependency: an autocommit AsyncSession, for single-statement writes."""
+    async with async_db_session(autocommit=True) as db:
+        yield db
+
 @contextmanager
 def db_session():
     """Yield a SQLAlchemy session; commits/rollbacks managed by caller."""
@@ -15,3 +70,12 @@ def db_session():
         yield db
     finally:
         db.close()
+
+@asynccontextmanager
+async def async_db_session(autocommit: bool = False):
+    """Yield an AsyncSession; commits/rollbacks managed by caller unless autocommit."""
+    db = AsyncAutocommitSessionLocal() if autocommit else AsyncSessionLocal()
+    try:
+        yield db
+    finally:
+        await db.close()
@@ -0,0 +1,41 @@
+"""SQLAlchemy Core tables for the statements built with insert()/select().
+
+Columns mirror docker/postgres/initdb.d/01_schema.sql, which stays the source of
+truth for the schema; only the tables the API writes through Core are declared.
+"""
+from sqlalchemy import Column, DateTime, Integer, MetaData, Table, Text, func
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+metadata = MetaData()
+
+campaigns = Table(
+    "campaigns",
+    metadata,
+    Column("id", UUID(as_uuid=True), primary_key=True, server_default=func.uuid_generate_v4()),
+    Column("name", Text, nullable=False, unique=True),
+    Column("system", Text, nullable=False),
+    Column("description", Text),
+    Column("config", JSONB(none_as_null=True), nullable=False),
+    Column("embedding_model", Text, nullable=False),
+    Column("embedding_dim", Integer, nullable=False),
+    Column("created_at", DateTime(timezone=True), nullable=False, server_default=func.now()),
+    # Bumped by update() statements: the UI's campaign list ETag relies on it.
+    Column("updated_at", DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.now()),
+)
+
+kb_documents = Table(
+    "kb_documents",
+    metadata,
+    Column("id", UUID(as_uuid=True), primary_key=True),
+    Column("campaign_id", UUID(as_uuid=True), nullable=False),
+    Column("source_file_id", UUID(as_uuid=True)),
+    Column("workspace_id", UUID(as_uuid=True)),
+    Column("doc_type", Text, nullable=False),
+    Column("title", Text, nullable=False),
+    Column("canonical_name", Text),
+    Column("frontmatter", JSONB, nullable=False),
+    Column("body_md", Text),
+    Column("content_hash", Text),
+    Column("created_at", DateTime(timezone=True), nullable=False, server_default=func.now()),
+    Column("updated_at", DateTime(timezone=True), nullable=False, server_default=func.now()),
+)
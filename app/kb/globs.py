@@ -0,0 +1,111 @@
+"""Include/exclude glob matching for source scans.
+
+A source's glob list is compiled into one regex with PurePosixPath.match semantics:
+a relative pattern matches the trailing components of a path ("*.md" matches at any
+depth) and wildcards never cross "/".
+"""
+from __future__ import annotations
+
+import logging
+import re
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _part_re(part: str) -> str:
+    """Regex for one path component; fnmatch.translate's rules, kept inside the component.
+
+    Character classes are parsed as fnmatch does (a leading "]" is literal, "[!]" is
+    any character, unclosed "[" is literal); "*", "?" and negated classes exclude "/".
+    """
+    out: List[str] = []
+    i, n = 0, len(part)
+    while i < n:
+        c = part[i]
+        i += 1
+        if c == "*":
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            j = i
+            if j < n and part[j] == "!":
+                j += 1
+            if j < n and part[j] == "]":
+                j += 1
+            while j < n and part[j] != "]":
+                j += 1
+            if j >= n:
+                out.append("\\[")
+                continue
+            stuff = part[i:j]
+            if "-" not in stuff:
+                stuff = stuff.replace("\\", "\\\\")
+            else:
+                chunks = []
+                k = i + 2 if part[i] == "!" else i + 1
+                while True:
+                    k = part.find("-", k, j)
+                    if k < 0:
+                        break
+                    chunks.append(part[i:k])
+                    i = k + 1
+                    k = k + 3
+                chunk = part[i:j]
+                if chunk:
+                    chunks.append(chunk)
+                else:
+                    chunks[-1] += "-"
+                # Drop empty ranges (z-a), which are invalid in a regex.
+                for k in range(len(chunks) - 1, 0, -1):
+                    if chunks[k - 1][-1] > chunks[k][0]:
+                        chunks[k - 1] = chunks[k - 1][:-1] + chunks[k][1:]
+                        del chunks[k]
+                # Only the hyphens that make ranges stay unescaped.
+                stuff = "-".join(s.replace("\\", "\\\\").replace("-", "\\-") for s in chunks)
+            stuff = re.sub(r"([&~|])", r"\\\1", stuff)
+            i = j + 1
+            if not stuff:
+                out.append("(?!)")
+            elif stuff == "!":
+                out.append("[^/]")
+            elif stuff[0] == "!":
+                # "/" goes last: right after "^" it would turn a literal leading "]" into the class end.
+                out.append("[^" + stuff[1:] + "/]")
+            else:
+                out.append("[\\" + stuff + "]" if stuff[0] in ("^", "[") else "[" + stuff + "]")
+        else:
+            out.append(re.escape(c))
+    return "".join(out)
+
+
+@lru_cache(maxsize=256)
+def compile_globs(patterns: Tuple[str, ...]) -> Optional[re.Pattern]:
+    """One regex for a source's glob list, or None when there is nothing to match.
+
+    Absolute or empty patterns can never match a relative path and are dropped; so
+    are patterns that don't compile, with a warning, instead of failing the scan.
+    """
+    alts = []
+    for pat in patterns:
+        parts = [p for p in pat.split("/") if p and p != "."]
+        if not parts or pat.startswith("/"):
+            continue
+        alt = "(?:" + "/".join(_part_re(p) for p in parts) + ")"
+        try:
+            re.compile(alt)
+        except re.error as e:
+            logger.warning("skipping invalid glob %r: %s", pat, e)
+            continue
+        alts.append(alt)
+    if not alts:
+        return None
+    return re.compile(r"(?:.*/)?(?:" + "|".join(alts) + r")\Z", re.DOTALL)
+
+
+def should_include(rel_posix: str, include_re: Optional[re.Pattern], exclude_re: Optional[re.Pattern]) -> bool:
+    if exclude_re is not None and exclude_re.match(rel_posix):
+        return False
+    return include_re is None or include_re.match(rel_posix) is not None
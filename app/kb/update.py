@@ -1,69 +1,149 @@
 from __future__ import annotations
 
 import hashlib
-import json
+import itertools
 import os
-from pathlib import Path, PurePosixPath
-from typing import Any, Dict, List, Optional, Tuple
+import re
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from uuid import uuid4
 
+from psycopg.types.json import Jsonb
 from sqlalchemy import text
 from app.core.db import SessionLocal
+from app.kb.globs import compile_globs, should_include
 
-def _sha256_file(path: Path, chunk_size: int = 1024 * 1024) -> str:
-    h = hashlib.sha256()
-    with path.open("rb") as f:
-        while True:
-            b = f.read(chunk_size)
-            if not b:
-                break
-            h.update(b)
-    return h.hexdigest()
+def _sha256_file(path: str) -> str:
+    # file_digest runs the read loop in C, straight into OpenSSL, with a fixed
+    # buffer: change detection never holds a whole file.
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
 
 def _sha256_text(s: str) -> str:
     return hashlib.sha256(s.encode("utf-8")).hexdigest()
 
-def _matches_any(rel_posix: str, patterns: List[str]) -> bool:
-    p = PurePosixPath(rel_posix)
-    for pat in patterns:
+def _scan(root: str, recursive: bool, follow_symlinks: bool) -> Iterator[Tuple[str, List[os.DirEntry]]]:
+    """Yield (dir_rel, file entries) per directory, parents before children.
+
+    Like os.walk, but hands back the DirEntry objects so a file's stat comes from the
+    scandir cache instead of a second syscall. Unreadable directories are skipped.
+    """
+    stack = [(root, "")]
+    while stack:
+        path, rel = stack.pop()
+        files: List[os.DirEntry] = []
         try:
-            if p.match(pat):
-                return True
-        except Exception:
+            with os.scandir(path) as it:
+                for e in it:
+                    try:
+                        is_dir = e.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if not is_dir:
+                        files.append(e)
+                    elif recursive and (follow_symlinks or not e.is_symlink()):
+                        stack.append((e.path, f"{rel}/{e.name}" if rel else e.name))
+        except OSError:
             continue
-    return False
-
-def _should_include(rel_posix: str, include_globs: List[str], exclude_globs: List[str]) -> bool:
-    if exclude_globs and _matches_any(rel_posix, exclude_globs):
-        return False
-    if not include_globs:
-        return True
-    return _matches_any(rel_posix, include_globs)
-
-def _chunk_text(text_str: str, max_chars: int = 6000, overlap: int = 300) -> List[str]:
-    s = text_str.strip()
-    if not s:
-        return []
-    out: List[str] = []
-    i = 0
-    while i < len(s):
-        j = min(len(s), i + max_chars)
-        out.append(s[i:j])
-        if j >= len(s):
+        yield rel, files
+
+_NON_SPACE = re.compile(r"\S")
+
+def _chunk_spans(text_str: str, max_chars: int = 6000, overlap: int = 300) -> Iterator[Tuple[int, int]]:
+    """Yield (start, end) offsets of the chunks of `text_str`, surrounding whitespace
+    excluded. Only offsets are produced; the text is sliced as each row is written."""
+    m = _NON_SPACE.search(text_str)
+    if m is None:
+        return
+    i = start = m.start()
+    end = len(text_str)
+    while text_str[end - 1].isspace():
+        end -= 1
+    while i < end:
+        j = min(end, i + max_chars)
+        yield (i, j)
+        if j >= end:
             break
-        i = max(0, j - overlap)
-    return out
-
-def _upsert_document_and_chunks(conn, campaign_id: str, source_file_id: str, title: str, doc_type: str, body: str) -> Tuple[str, str]:
-    content_hash = _sha256_text(body)
-
+        i = max(start, j - overlap)
+
+# Documents with more chunks than this are loaded with COPY rather than a batched INSERT.
+_CHUNK_COPY_THRESHOLD = 200
+
+# Bound as-is: psycopg sends Jsonb values typed as jsonb, so neither a per-row
+# json.dumps nor a text->jsonb cast is needed.
+_CHUNK_METADATA = Jsonb({"v": 0})
+
+_CHUNK_COLS = ("campaign_id", "document_id", "section_path", "chunk_index", "content", "metadata", "embedding_model")
+
+# Plain psycopg SQL (%s placeholders): chunks go straight to the driver cursor.
+_SQL_INSERT_CHUNK = f"INSERT INTO kb_chunks ({', '.join(_CHUNK_COLS)}) VALUES ({', '.join(['%s'] * len(_CHUNK_COLS))})"
+
+def _raw_connection(db):
+    """The session's psycopg connection, inside the same transaction.
+
+    For the ingest hot paths, where SQLAlchemy's result processing costs more than
+    the queries themselves; the API's low-volume CRUD stays on SQLAlchemy.
+    """
+    return db.connection().connection.driver_connection
+
+def _insert_chunks(conn, campaign_id: str, doc_id: str, body: str) -> None:
+    """Write a document's chunks in one executemany, or one COPY for big documents.
+
+    Rows are generated as they are sent, so at most one chunk's text is held apart
+    from `body` at a time.
+    """
+    spans = list(_chunk_spans(body))
+    if not spans:
+        return
+    rows = (
+        (campaign_id, doc_id, "", idx, body[start:end], _CHUNK_METADATA, "nomic-embed-text")
+        for idx, (start, end) in enumerate(spans)
+    )
+    with _raw_connection(conn).cursor() as cur:
+        if len(spans) <= _CHUNK_COPY_THRESHOLD:
+            cur.executemany(_SQL_INSERT_CHUNK, rows)
+            return
+        with cur.copy(f"COPY kb_chunks ({', '.join(_CHUNK_COLS)}) FROM STDIN") as copy:
+            for r in rows:
+                copy.write_row(r)
+
+# Built once: these run per ingested file.
+_SQL_SELECT_DOCUMENT = text(
+    """
+    SELECT id, content_hash
+    FROM kb_documents
+    WHERE campaign_id = :campaign_id AND source_file_id = :source_file_id
+    """
+)
+
+_SQL_UPDATE_DOCUMENT = text(
+    """
+    UPDATE kb_documents
+    SET title = :title,
+        doc_type = :doc_type,
+        body_md = :body,
+        content_hash = :content_hash,
+        updated_at = now()
+    WHERE id = :id
+    """
+)
+
+_SQL_DELETE_CHUNKS = text("DELETE FROM kb_chunks WHERE document_id = :doc_id")
+
+_SQL_INSERT_DOCUMENT = text(
+    """
+    INSERT INTO kb_documents (campaign_id, source_file_id, doc_type, title, body_md, content_hash)
+    VALUES (:campaign_id, :source_file_id, :doc_type, :title, :body, :content_hash)
+    RETURNING id
+    """
+)
+
+def _upsert_document_and_chunks(
+    conn, campaign_id: str, source_file_id: str, title: str, doc_type: str, body: str, content_hash: str
+) -> Tuple[str, str]:
     doc_row = conn.execute(
-        text(
-            """
-            SELECT id, content_hash
-            FROM kb_documents
-            WHERE campaign_id = :campaign_id AND source_file_id = :source_file_id
-            """
-        ),
+        _SQL_SELECT_DOCUMENT,
         {"campaign_id": campaign_id, "source_file_id": source_file_id},
     ).mappings().first()
 
@@ -73,75 +153,471 @@ def _upsert_document_and_chunks(conn, campaign_id: str, source_file_id: str, tit
     if doc_row:
         doc_id = str(doc_row["id"])
         conn.execute(
-            text(
-                """
-                UPDATE kb_documents
-                SET title = :title,
-                    doc_type = :doc_type,
-                    body_md = :body,
-                    content_hash = :content_hash,
-                    updated_at = now()
-                WHERE id = :id
-                """
-            ),
+            _SQL_UPDATE_DOCUMENT,
             {"id": doc_id, "title": title, "doc_type": doc_type, "body": body, "content_hash": content_hash},
         )
-        conn.execute(text("DELETE FROM kb_chunks WHERE document_id = :doc_id"), {"doc_id": doc_id})
+        conn.execute(_SQL_DELETE_CHUNKS, {"doc_id": doc_id})
     else:
         doc_id = conn.execute(
-            text(
-                """
-                INSERT INTO kb_documents (campaign_id, source_file_id, doc_type, title, body_md, content_hash)
-                VALUES (:campaign_id, :source_file_id, :doc_type, :title, :body, :content_hash)
-                RETURNING id
-                """
-            ),
+            _SQL_INSERT_DOCUMENT,
             {"campaign_id": campaign_id, "source_file_id": source_file_id, "doc_type": doc_type, "title": title, "body": body, "content_hash": content_hash},
         ).scalar_one()
 
-    chunks = _chunk_text(body)
-    for idx, ch in enumerate(chunks):
-        conn.execute(
+    _insert_chunks(conn, campaign_id, str(doc_id), body)
+    return (str(doc_id), "ingested")
+
+_SQL_UPSERT_SOURCE_FILES = text(
+    """
+    INSERT INTO source_files (
+      source_id, folder_id, rel_path, ext, size_bytes, mtime_epoch, sha256,
+      status, last_seen_at, last_ingest_status
+    )
+    SELECT CAST(:source_id AS uuid), f.folder_id, f.rel_path, f.ext, f.size_bytes, f.mtime_epoch, f.sha256,
+           'seen', now(), 'never'
+    FROM unnest(
+      CAST(:folder_ids AS uuid[]), CAST(:rel_paths AS text[]), CAST(:exts AS text[]),
+      CAST(:sizes AS bigint[]), CAST(:mtimes AS bigint[]), CAST(:sha256s AS text[])
+    ) AS f(folder_id, rel_path, ext, size_bytes, mtime_epoch, sha256)
+    ON CONFLICT (source_id, rel_path) DO UPDATE
+    SET folder_id = excluded.folder_id,
+        ext = excluded.ext,
+        size_bytes = excluded.size_bytes,
+        mtime_epoch = excluded.mtime_epoch,
+        sha256 = excluded.sha256,
+        status = 'seen',
+        last_seen_at = now()
+    RETURNING id, rel_path
+    """
+)
+
+_SQL_UPDATE_INGEST_STATUS = text(
+    """
+    UPDATE source_files sf
+    SET last_ingested_at = now(),
+        last_ingest_status = r.status,
+        error = r.error
+    FROM unnest(CAST(:ids AS uuid[]), CAST(:statuses AS text[]), CAST(:errors AS text[])) AS r(id, status, error)
+    WHERE sf.id = r.id
+    """
+)
+
+_SQL_INSERT_RUN_FILES = text(
+    """
+    INSERT INTO ingest_run_files (ingest_run_id, source_file_id, action, status, error)
+    SELECT CAST(:run_id AS uuid), r.file_id, 'ingest', r.status, r.error
+    FROM unnest(CAST(:file_ids AS uuid[]), CAST(:statuses AS text[]), CAST(:errors AS text[])) AS r(file_id, status, error)
+    ON CONFLICT (ingest_run_id, source_file_id) DO UPDATE SET status = excluded.status, error = excluded.error
+    """
+)
+
+# Files stat'ed before their rows are written and their documents ingested.
+_FILE_BATCH = 500
+# Files hashed or read in the pool at once. Bounds what a batch holds in memory (a
+# read document per slot) independently of the batch size.
+_IN_FLIGHT = 2 * (os.cpu_count() or 1)
+_EXISTING_ITERSIZE = 10000
+
+_SQL_INSERT_FOLDERS = text(
+    """
+    INSERT INTO source_folders (id, source_id, rel_path, parent_id, depth, last_seen_at)
+    SELECT f.id, CAST(:source_id AS uuid), f.rel_path, f.parent_id, f.depth, now()
+    FROM unnest(
+      CAST(:ids AS uuid[]), CAST(:rel_paths AS text[]), CAST(:parent_ids AS uuid[]), CAST(:depths AS int[])
+    ) AS f(id, rel_path, parent_id, depth)
+    ON CONFLICT (source_id, rel_path) DO UPDATE SET last_seen_at = now()
+    RETURNING id, rel_path
+    """
+)
+
+def _insert_folders(db, source_id: str, folders: List[Dict[str, Any]], folder_map: Dict[str, str]) -> None:
+    """Insert queued folders in one statement, keeping folder_map on the ids that won."""
+    if not folders:
+        return
+    rows = db.execute(
+        _SQL_INSERT_FOLDERS,
+        {
+            "source_id": source_id,
+            "ids": [f["id"] for f in folders],
+            "rel_paths": [f["rel_path"] for f in folders],
+            "parent_ids": [f["parent_id"] for f in folders],
+            "depths": [f["depth"] for f in folders],
+        },
+    ).all()
+    for r in rows:
+        folder_map[r.rel_path] = str(r.id)
+
+def _upsert_source_files(db, source_id: str, files: List[Dict[str, Any]]) -> Dict[str, str]:
+    """Insert or refresh a directory's files in one statement; returns rel_path -> id.
+
+    The upsert also revives rows previously marked deleted for a path seen again.
+    """
+    rows = db.execute(
+        _SQL_UPSERT_SOURCE_FILES,
+        {
+            "source_id": source_id,
+            "folder_ids": [f["folder_id"] for f in files],  # resolved by _flush_files
+            "rel_paths": [f["rel_path"] for f in files],
+            "exts": [f["ext"] for f in files],
+            "sizes": [f["size_bytes"] for f in files],
+            "mtimes": [f["mtime_epoch"] for f in files],
+            "sha256s": [f["sha256"] for f in files],
+        },
+    ).all()
+    return {r.rel_path: str(r.id) for r in rows}
+
+def _record_ingest_results(db, run_id: str, results: List[Tuple[str, str, Optional[str]]]) -> None:
+    """Stamp (file_id, ingest_status, error) results on source_files and the run, one statement each."""
+    if not results:
+        return
+    ids = [r[0] for r in results]
+    statuses = [r[1] for r in results]
+    errors = [r[2] for r in results]
+    db.execute(_SQL_UPDATE_INGEST_STATUS, {"ids": ids, "statuses": statuses, "errors": errors})
+    # ingest_run_files only knows ok/error; a skipped document was still processed fine.
+    run_statuses = ["error" if st == "error" else "ok" for st in statuses]
+    db.execute(_SQL_INSERT_RUN_FILES, {"run_id": run_id, "file_ids": ids, "statuses": run_statuses, "errors": errors})
+
+def _read_document(path: str) -> Tuple[str, str]:
+    """(body, content_hash) of a file to ingest; only files found changed are read.
+
+    The body is decoded like a text-mode read (invalid UTF-8 replaced, newlines
+    normalized) and content_hash is the sha256 of its UTF-8 encoding: that is the
+    hash of the bytes read unless decoding changed them, so the body is only
+    re-encoded then.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    try:
+        body = data.decode("utf-8")
+    except UnicodeDecodeError:
+        body = data.decode("utf-8", errors="replace")
+    else:
+        if "\r" not in body:
+            return body, hashlib.sha256(data).hexdigest()
+    del data
+    body = body.replace("\r\n", "\n").replace("\r", "\n")
+    return body, _sha256_text(body)
+
+def _pool_map(pool: Executor, fn: Callable[[str], Any], files: Iterable[Dict[str, Any]]) -> Iterator[Tuple[Dict[str, Any], Future]]:
+    """Yield (file, future of fn(file's full_path)) in completion order.
+
+    At most _IN_FLIGHT files are submitted at a time, and a future is dropped as
+    soon as it is handed out, so results don't pile up until the batch is done.
+    """
+    it = iter(files)
+    running: Dict[Future, Dict[str, Any]] = {}
+    for f in itertools.islice(it, _IN_FLIGHT):
+        running[pool.submit(fn, f["full_path"])] = f
+    while running:
+        done, _ = wait(running, return_when=FIRST_COMPLETED)
+        for fut in done:
+            f = running.pop(fut)
+            nxt = next(it, None)
+            if nxt is not None:
+                running[pool.submit(fn, nxt["full_path"])] = nxt
+            yield f, fut
+
+def _resolve_changes(pool: Executor, files: List[Dict[str, Any]], stats: Dict[str, Any]) -> None:
+    """Hash the batch's files that need it across the pool, then settle and tally
+    each file's change status (`ingest`)."""
+    for f, fut in _pool_map(pool, _sha256_file, (f for f in files if f["needs_hash"])):
+        try:
+            digest = fut.result()
+        except OSError as e:
+            # Fall back to the mtime/size verdict; a read failure surfaces at ingest.
+            stats["errors"].append(f"hash failed for {f['rel_path']}: {e}")
+            continue
+        f["changed"] = f["is_new"] or f["sha256"] != digest
+        f["sha256"] = digest
+    for f in files:
+        if f["is_new"]:
+            stats["files_new"] += 1
+        elif f["changed"]:
+            stats["files_changed"] += 1
+        else:
+            stats["files_unchanged"] += 1
+        f["ingest"] = f["is_new"] or f["changed"] or f["retry"]
+
+def _flush_files(
+    db,
+    pool: Executor,
+    campaign_id: str,
+    source_id: str,
+    run_id: str,
+    new_folders: List[Dict[str, Any]],
+    folder_map: Dict[str, str],
+    files: List[Dict[str, Any]],
+    stats: Dict[str, Any],
+    dry_run: bool,
+    budget: Optional[int],
+) -> int:
+    """Write queued folders and a batch of stat'ed files, then ingest the changed ones
+    (at most `budget` when set). Returns how many files ingestion was attempted for.
+
+    Hashing and reading run in `pool` (hashlib and file reads release the GIL); the
+    DB writes stay on this thread, which owns the session. Files are hashed by
+    streaming them, and only the ones to ingest are then read whole.
+    """
+    _insert_folders(db, source_id, new_folders, folder_map)
+    new_folders.clear()
+    if not files:
+        return 0
+    _resolve_changes(pool, files, stats)
+    for f in files:
+        f["folder_id"] = folder_map[f["dir_rel"]]
+    file_ids = _upsert_source_files(db, source_id, files)
+    if dry_run:
+        return 0
+
+    to_ingest = [f for f in files if f["ingest"]]
+    if budget is not None:
+        to_ingest = to_ingest[:max(budget, 0)]
+    results: List[Tuple[str, str, Optional[str]]] = []
+    for f, fut in _pool_map(pool, _read_document, to_ingest):
+        source_file_id = file_ids[f["rel_path"]]
+        try:
+            body, content_hash = fut.result()
+            title = os.path.splitext(f["name"])[0]
+            doc_type = "md" if f["ext"] == "md" else (f["ext"] or "file")
+
+            # A savepoint per file: a failing document rolls back alone and is
+            # recorded as that file's error, the rest of the batch still commits.
+            with db.begin_nested():
+                _, doc_action = _upsert_document_and_chunks(
+                    conn=db,
+                    campaign_id=campaign_id,
+                    source_file_id=source_file_id,
+                    title=title,
+                    doc_type=doc_type,
+                    body=body,
+                    content_hash=content_hash,
+                )
+            del body
+
+            if doc_action == "ingested":
+                stats["files_ingested"] += 1
+                stats["docs_ingested"] += 1
+                results.append((source_file_id, "ok", None))
+            else:
+                stats["docs_skipped"] += 1
+                results.append((source_file_id, "skipped", None))
+        except Exception as e:
+            stats["errors"].append(f"ingest failed for {f['rel_path']}: {e}")
+            results.append((source_file_id, "error", str(e)[:5000]))
+    _record_ingest_results(db, run_id, results)
+    return len(to_ingest)
+
+def _scan_source(
+    db,
+    pool: Executor,
+    campaign_id: str,
+    run_id: str,
+    src: Dict[str, Any],
+    stats: Dict[str, Any],
+    dry_run: bool,
+    force_rehash: bool,
+    max_files: Optional[int],
+) -> None:
+    """Walk one source, write its files/folders and ingest what changed.
+
+    Commits after every file batch; the caller commits the tail (folder touches and
+    deletions), which only run once the whole walk succeeded.
+    """
+    source_id = str(src["id"])
+    root_path = Path(src["root_path"])
+    include_re = compile_globs(tuple(src["include_globs"] or ()))
+    exclude_re = compile_globs(tuple(src["exclude_globs"] or ()))
+    change_detection = src["change_detection"]
+
+    db.execute(text("UPDATE campaign_sources SET last_scan_at = now() WHERE id = :id"), {"id": source_id})
+
+    if not root_path.exists():
+        stats["errors"].append(f"Source '{src['name']}' root_path not found: {root_path}")
+        return
+
+    # Both maps can hold a row per file of the source: read them as plain
+    # tuples off the driver cursor. existing_map values are
+    # (id, size_bytes, mtime_epoch, sha256, last_ingest_status). The file list goes through a
+    # server-side cursor, fetched _EXISTING_ITERSIZE rows at a time, so the client
+    # never buffers the whole result on top of the map.
+    raw = _raw_connection(db)
+    with raw.cursor(name="existing_source_files") as cur:
+        cur.itersize = _EXISTING_ITERSIZE
+        cur.execute(
+            """
+            SELECT rel_path, id, size_bytes, mtime_epoch, sha256, last_ingest_status
+            FROM source_files
+            WHERE source_id = %s AND status <> 'deleted'
+            """,
+            (source_id,),
+        )
+        existing_map = {r[0]: r[1:] for r in cur}
+    with raw.cursor() as cur:
+        cur.execute("SELECT rel_path, id FROM source_folders WHERE source_id = %s", (source_id,))
+        folder_map = {r[0]: str(r[1]) for r in cur}
+    seen_paths = set()
+
+    # Folders are written in bulk: new ones get their ids here (children can
+    # point at a parent that isn't inserted yet) and go out with the next file
+    # batch; known ones are touched in one UPDATE after the walk.
+    new_folders: List[Dict[str, Any]] = []
+    touched_dirs: List[str] = []
+    pending: List[Dict[str, Any]] = []
+    files_to_ingest = 0
+    # Relative paths are built as strings: Path objects per directory and file
+    # cost more than the walk itself on warm caches.
+    for dir_rel, entries in _scan(str(root_path), bool(src["recursive"]), bool(src["follow_symlinks"])):
+
+        if dir_rel in folder_map:
+            touched_dirs.append(dir_rel)
+        else:
+            parent_rel = dir_rel.rpartition("/")[0] if dir_rel else None
+            folder_map[dir_rel] = str(uuid4())
+            new_folders.append(
+                {
+                    "id": folder_map[dir_rel],
+                    "rel_path": dir_rel,
+                    "parent_id": folder_map.get(parent_rel) if parent_rel is not None else None,
+                    "depth": dir_rel.count("/") + 1 if dir_rel else 0,
+                }
+            )
+
+        for entry in entries:
+            fn = entry.name
+            rel_path = f"{dir_rel}/{fn}" if dir_rel else fn
+
+            if not should_include(rel_path, include_re, exclude_re):
+                continue
+
+            full_path = entry.path
+            try:
+                st = entry.stat()
+            except OSError as e:
+                stats["errors"].append(f"stat failed for {full_path}: {e}")
+                continue
+
+            seen_paths.add(rel_path)
+            stats["files_seen"] += 1
+
+            size_bytes = int(st.st_size)
+            mtime_epoch = int(st.st_mtime)
+
+            prev = existing_map.get(rel_path)
+            is_new = prev is None
+            changed_hint = is_new or (prev[1] != size_bytes or prev[2] != mtime_epoch)
+
+            # 'sha256' hashes every file; 'auto' trusts a matching mtime+size and
+            # only hashes to confirm a change; 'mtime_size' never reads the file.
+            # Hashing itself happens per batch, in the pool (_resolve_changes).
+            needs_hash = change_detection == "sha256" or (
+                change_detection == "auto" and (force_rehash or changed_hint)
+            )
+
+            pending.append(
+                {
+                    "full_path": full_path,
+                    "name": fn,
+                    "rel_path": rel_path,
+                    "dir_rel": dir_rel,
+                    "ext": os.path.splitext(fn)[1].lower().lstrip(".") or None,
+                    "size_bytes": size_bytes,
+                    "mtime_epoch": mtime_epoch,
+                    "sha256": prev[3] if prev else None,
+                    "is_new": is_new,
+                    "changed": changed_hint,
+                    # Unchanged files are only re-read when their last ingest didn't
+                    # succeed (error, or never attempted after a dry run).
+                    "retry": prev is not None and prev[4] not in ("ok", "skipped"),
+                    "needs_hash": needs_hash,
+                }
+            )
+
+            # Checked per file, not per directory: one huge directory is still
+            # split into batches of _FILE_BATCH.
+            if len(pending) < _FILE_BATCH:
+                continue
+            files_to_ingest += _flush_files(
+                db, pool, campaign_id, source_id, run_id, new_folders, folder_map, pending, stats,
+                dry_run, None if max_files is None else max_files - files_to_ingest,
+            )
+            pending = []
+            # Commit per batch: keeps the transaction (and its locks and WAL) small on
+            # big sources, and lets readers see progress.
+            db.commit()
+
+    files_to_ingest += _flush_files(
+        db, pool, campaign_id, source_id, run_id, new_folders, folder_map, pending, stats,
+        dry_run, None if max_files is None else max_files - files_to_ingest,
+    )
+    if touched_dirs:
+        db.execute(
+            text(
+                "UPDATE source_folders SET last_seen_at = now() "
+                "WHERE source_id = :sid AND rel_path = ANY(CAST(:paths AS text[]))"
+            ),
+            {"sid": source_id, "paths": touched_dirs},
+        )
+
+    missing_ids = [str(prev[0]) for rel_path, prev in existing_map.items() if rel_path not in seen_paths]
+    stats["files_deleted"] += len(missing_ids)
+    if missing_ids and not dry_run:
+        db.execute(
+            text("UPDATE source_files SET status='deleted', last_seen_at=now() WHERE id = ANY(CAST(:ids AS uuid[]))"),
+            {"ids": missing_ids},
+        )
+        db.execute(
             text(
                 """
-                INSERT INTO kb_chunks (campaign_id, document_id, section_path, chunk_index, content, metadata, embedding, embedding_model)
-                VALUES (:campaign_id, :document_id, :section_path, :chunk_index, :content, :metadata::jsonb, NULL, :embedding_model)
+                INSERT INTO ingest_run_files (ingest_run_id, source_file_id, action, status, reason)
+                SELECT CAST(:run_id AS uuid), f.id, 'delete', 'ok', 'missing_on_disk'
+                FROM unnest(CAST(:ids AS uuid[])) AS f(id)
+                ON CONFLICT (ingest_run_id, source_file_id) DO NOTHING
                 """
             ),
-            {
-                "campaign_id": campaign_id,
-                "document_id": str(doc_id),
-                "section_path": "",
-                "chunk_index": idx,
-                "content": ch,
-                "metadata": json.dumps({"v": 0}),
-                "embedding_model": "nomic-embed-text",
-            },
+            {"run_id": run_id, "ids": missing_ids},
         )
-    return (str(doc_id), "ingested")
+
+    if not dry_run:
+        db.execute(text("UPDATE campaign_sources SET last_ingest_at = now() WHERE id = :id"), {"id": source_id})
 
 def update_campaign_kb(
     campaign_id: str,
     dry_run: bool = False,
     force_rehash: bool = False,
     max_files: Optional[int] = None,
+    ingest_run_id: Optional[str] = None,
 ) -> Dict[str, Any]:
+    """Scan the campaign's sources and ingest what changed.
+
+    Pass `ingest_run_id` to execute a run queued by the API; otherwise a new run is
+    created. The run row is committed as 'running' first; each source then commits
+    on its own (see _scan_source), and the final status and stats go out in a last
+    small transaction. A source that fails is recorded in the errors and skipped.
+    """
     db = SessionLocal()
+    pool = ThreadPoolExecutor(max_workers=os.cpu_count())
     try:
         exists = db.execute(text("SELECT 1 FROM campaigns WHERE id = :id"), {"id": campaign_id}).scalar()
         if not exists:
             raise ValueError("Campaign not found.")
 
-        ingest_run_id = db.execute(
-            text(
-                """
-                INSERT INTO ingest_runs (campaign_id, trigger, status)
-                VALUES (:campaign_id, 'api', 'running')
-                RETURNING id
-                """
-            ),
-            {"campaign_id": campaign_id},
-        ).scalar_one()
+        if ingest_run_id is None:
+            ingest_run_id = db.execute(
+                text(
+                    """
+                    INSERT INTO ingest_runs (campaign_id, trigger, status)
+                    VALUES (:campaign_id, 'api', 'running')
+                    RETURNING id
+                    """
+                ),
+                {"campaign_id": campaign_id},
+            ).scalar_one()
+        else:
+            db.execute(
+                text("UPDATE ingest_runs SET status = 'running', started_at = now() WHERE id = :id"),
+                {"id": ingest_run_id},
+            )
+        db.commit()
 
         stats: Dict[str, Any] = {
             "sources_total": 0,
@@ -172,260 +648,14 @@ def update_campaign_kb(
 
         for src in sources:
             stats["sources_scanned"] += 1
-            source_id = str(src["id"])
-            root_path = Path(src["root_path"])
-            include_globs = list(src["include_globs"] or [])
-            exclude_globs = list(src["exclude_globs"] or [])
-            change_detection = src["change_detection"]
-
-            db.execute(text("UPDATE campaign_sources SET last_scan_at = now() WHERE id = :id"), {"id": source_id})
-
-            if not root_path.exists():
-                stats["errors"].append(f"Source '{src['name']}' root_path not found: {root_path}")
-                continue
-
-            existing = db.execute(
-                text(
-                    """
-                    SELECT id, rel_path, size_bytes, mtime_epoch, sha256, status
-                    FROM source_files
-                    WHERE source_id = :source_id AND status <> 'deleted'
-                    """
-                ),
-                {"source_id": source_id},
-            ).mappings().all()
-            existing_map = {r["rel_path"]: r for r in existing}
-            seen_paths = set()
-
-            folder_rows = db.execute(
-                text(
-                    """
-                    SELECT id, rel_path
-                    FROM source_folders
-                    WHERE source_id = :source_id
-                    """
-                ),
-                {"source_id": source_id},
-            ).mappings().all()
-            folder_map = {r["rel_path"]: str(r["id"]) for r in folder_rows}
-
-            if "" not in folder_map:
-                root_folder_id = db.execute(
-                    text(
-                        """
-                        INSERT INTO source_folders (source_id, rel_path, parent_id, depth, last_seen_at)
-                        VALUES (:source_id, '', NULL, 0, now())
-                        ON CONFLICT (source_id, rel_path) DO UPDATE SET last_seen_at = now()
-                        RETURNING id
-                        """
-                    ),
-                    {"source_id": source_id},
-                ).scalar_one()
-                folder_map[""] = str(root_folder_id)
-            else:
-                db.execute(
-                    text("UPDATE source_folders SET last_seen_at = now() WHERE source_id = :sid AND rel_path = ''"),
-                    {"sid": source_id},
-                )
-
-            files_to_ingest = 0
-            for dirpath, _, filenames in os.walk(root_path, followlinks=bool(src["follow_symlinks"])):
-                dir_rel = Path(dirpath).relative_to(root_path).as_posix()
-                parent_rel = "" if dir_rel == "" else PurePosixPath(dir_rel).parent.as_posix()
-                depth = 0 if dir_rel == "" else len(PurePosixPath(dir_rel).parts)
-
-                if dir_rel not in folder_map:
-                    parent_id = folder_map.get(parent_rel, folder_map[""])
-                    folder_id = db.execute(
-                        text(
-                            """
-                            INSERT INTO source_folders (source_id, rel_path, parent_id, depth, last_seen_at)
-                            VALUES (:source_id, :rel_path, :parent_id, :depth, now())
-                            ON CONFLICT (source_id, rel_path) DO UPDATE SET last_seen_at = now()
-                            RETURNING id
-                            """
-                        ),
-                        {"source_id": source_id, "rel_path": dir_rel, "parent_id": parent_id, "depth": depth},
-                    ).scalar_one()
-                    folder_map[dir_rel] = str(folder_id)
-                else:
-                    db.execute(
-                        text("UPDATE source_folders SET last_seen_at = now() WHERE source_id = :sid AND rel_path = :rp"),
-                        {"sid": source_id, "rp": dir_rel},
-                    )
-
-                for fn in filenames:
-                    full_path = Path(dirpath) / fn
-                    rel_path = full_path.relative_to(root_path).as_posix()
-
-                    if not _should_include(rel_path, include_globs, exclude_globs):
-                        continue
-
-                    try:
-                        st = full_path.stat()
-                    except OSError as e:
-                        stats["errors"].append(f"stat failed for {full_path}: {e}")
-                        continue
-
-                    seen_paths.add(rel_path)
-                    stats["files_seen"] += 1
-
-                    size_bytes = int(st.st_size)
-                    mtime_epoch = int(st.st_mtime)
-
-                    prev = existing_map.get(rel_path)
-                    is_new = prev is None
-                    changed_hint = is_new or (prev["size_bytes"] != size_bytes or prev["mtime_epoch"] != mtime_epoch)
-
-                    sha256 = prev["sha256"] if prev else None
-                    changed = changed_hint
-
-                    if (change_detection in ("sha256", "auto") and (force_rehash or changed_hint or is_new)):
-                        sha256_now = _sha256_file(full_path)
-                        if prev and prev["sha256"] == sha256_now:
-                            changed = False
-                        sha256 = sha256_now
-
-                    folder_id = folder_map.get(dir_rel, folder_map[""])
-                    ext = full_path.suffix.lower().lstrip(".") or None
-
-                    if is_new:
-                        stats["files_new"] += 1
-                    elif changed:
-                        stats["files_changed"] += 1
-                    else:
-                        stats["files_unchanged"] += 1
-
-                    if is_new:
-                        source_file_id = db.execute(
-                            text(
-                                """
-                                INSERT INTO source_files (
-                                  source_id, folder_id, rel_path, ext, size_bytes, mtime_epoch, sha256,
-                                  status, last_seen_at, last_ingest_status
-                                )
-                                VALUES (
-                                  :source_id, :folder_id, :rel_path, :ext, :size_bytes, :mtime_epoch, :sha256,
-                                  'seen', now(), 'never'
-                                )
-                                RETURNING id
-                                """
-                            ),
-                            {"source_id": source_id, "folder_id": folder_id, "rel_path": rel_path, "ext": ext, "size_bytes": size_bytes, "mtime_epoch": mtime_epoch, "sha256": sha256},
-                        ).scalar_one()
-                    else:
-                        source_file_id = str(prev["id"])
-                        db.execute(
-                            text(
-                                """
-                                UPDATE source_files
-                                SET folder_id = :folder_id,
-                                    ext = :ext,
-                                    size_bytes = :size_bytes,
-                                    mtime_epoch = :mtime_epoch,
-                                    sha256 = :sha256,
-                                    status = 'seen',
-                                    last_seen_at = now()
-                                WHERE id = :id
-                                """
-                            ),
-                            {"id": source_file_id, "folder_id": folder_id, "ext": ext, "size_bytes": size_bytes, "mtime_epoch": mtime_epoch, "sha256": sha256},
-                        )
-
-                    if (is_new or changed) and not dry_run:
-                        if max_files is not None and files_to_ingest >= max_files:
-                            continue
-
-                        try:
-                            files_to_ingest += 1
-                            body = full_path.read_text(encoding="utf-8", errors="replace")
-                            title = full_path.stem
-                            doc_type = "md" if ext == "md" else (ext or "file")
-
-                            _, doc_action = _upsert_document_and_chunks(
-                                conn=db,
-                                campaign_id=campaign_id,
-                                source_file_id=source_file_id,
-                                title=title,
-                                doc_type=doc_type,
-                                body=body,
-                            )
-
-                            if doc_action == "ingested":
-                                stats["files_ingested"] += 1
-                                stats["docs_ingested"] += 1
-                                ingest_status = "ok"
-                            else:
-                                stats["docs_skipped"] += 1
-                                ingest_status = "skipped"
-
-                            db.execute(
-                                text(
-                                    """
-                                    UPDATE source_files
-                                    SET last_ingested_at = now(),
-                                        last_ingest_status = :status,
-                                        error = NULL
-                                    WHERE id = :id
-                                    """
-                                ),
-                                {"id": source_file_id, "status": ingest_status},
-                            )
-
-                            db.execute(
-                                text(
-                                    """
-                                    INSERT INTO ingest_run_files (ingest_run_id, source_file_id, action, status)
-                                    VALUES (:run_id, :file_id, 'ingest', 'ok')
-                                    ON CONFLICT (ingest_run_id, source_file_id) DO NOTHING
-                                    """
-                                ),
-                                {"run_id": str(ingest_run_id), "file_id": source_file_id},
-                            )
-                        except Exception as e:
-                            stats["errors"].append(f"ingest failed for {rel_path}: {e}")
-                            db.execute(
-                                text(
-                                    """
-                                    UPDATE source_files
-                                    SET last_ingested_at = now(),
-                                        last_ingest_status = 'error',
-                                        error = :err
-                                    WHERE id = :id
-                                    """
-                                ),
-                                {"id": source_file_id, "err": str(e)[:5000]},
-                            )
-                            db.execute(
-                                text(
-                                    """
-                                    INSERT INTO ingest_run_files (ingest_run_id, source_file_id, action, status, error)
-                                    VALUES (:run_id, :file_id, 'ingest', 'error', :err)
-                                    ON CONFLICT (ingest_run_id, source_file_id) DO UPDATE SET status='error', error=excluded.error
-                                    """
-                                ),
-                                {"run_id": str(ingest_run_id), "file_id": source_file_id, "err": str(e)[:5000]},
-                            )
-
-            for rel_path, prev in existing_map.items():
-                if rel_path in seen_paths:
-                    continue
-                stats["files_deleted"] += 1
-                if not dry_run:
-                    db.execute(text("UPDATE source_files SET status='deleted', last_seen_at=now() WHERE id=:id"), {"id": str(prev["id"])})
-                    db.execute(
-                        text(
-                            """
-                            INSERT INTO ingest_run_files (ingest_run_id, source_file_id, action, status, reason)
-                            VALUES (:run_id, :file_id, 'delete', 'ok', 'missing_on_disk')
-                            ON CONFLICT (ingest_run_id, source_file_id) DO NOTHING
-                            """
-                        ),
-                        {"run_id": str(ingest_run_id), "file_id": str(prev["id"])},
-                    )
-
-            if not dry_run:
-                db.execute(text("UPDATE campaign_sources SET last_ingest_at = now() WHERE id = :id"), {"id": source_id})
+            try:
+                _scan_source(db, pool, campaign_id, str(ingest_run_id), src, stats, dry_run, force_rehash, max_files)
+                db.commit()
+            except Exception as e:
+                # Earlier sources and this one's committed batches are kept; the run
+                # ends 'partial' instead of rolling everything back.
+                db.rollback()
+                stats["errors"].append(f"Source '{src['name']}' failed: {e}")
 
         status = "ok" if not stats["errors"] else "partial"
         db.execute(
@@ -434,18 +664,31 @@ def update_campaign_kb(
                 UPDATE ingest_runs
                 SET finished_at = now(),
                     status = :status,
-                    stats = :stats::jsonb,
+                    stats = :stats,
                     error = :error
                 WHERE id = :id
                 """
             ),
-            {"id": str(ingest_run_id), "status": status, "stats": json.dumps(stats), "error": "\n".join(stats["errors"])[:5000] if stats["errors"] else None},
+            {"id": str(ingest_run_id), "status": status, "stats": Jsonb(stats), "error": "\n".join(stats["errors"])[:5000] if stats["errors"] else None},
         )
 
         db.commit()
         return {"ingest_run_id": str(ingest_run_id), "status": status, "stats": stats}
-    except Exception:
+    except Exception as e:
         db.rollback()
+        if ingest_run_id is not None:
+            db.execute(
+                text(
+                    """
+                    UPDATE ingest_runs
+                    SET finished_at = now(), status = 'error', error = :error
+                    WHERE id = :id
+                    """
+                ),
+                {"id": str(ingest_run_id), "error": str(e)[:5000]},
+            )
+            db.commit()
         raise
     finally:
+        pool.shutdown(cancel_futures=True)
         db.close()
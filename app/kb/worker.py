@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Dict
+
+from app.core.config import settings
+from app.kb.update import update_campaign_kb
+
+# Scans are long and synchronous (filesystem + psycopg). They get their own executor
+# rather than Starlette's shared threadpool, so a few big scans can't starve the sync
+# handlers of threads, and at most kb_update_workers scans hold a DB connection.
+_executor = ThreadPoolExecutor(max_workers=settings.kb_update_workers, thread_name_prefix="kb-update")
+
+
+async def run_update(**kwargs: Any) -> Dict[str, Any]:
+    """Run update_campaign_kb on the scan executor and await its stats."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, partial(update_campaign_kb, **kwargs))
@@ -2,6 +2,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.routes import router as api_router
+from app.core.responses import ORJSONResponse
 from app.ui.routes import router as ui_router
 
 tags_metadata = [
@@ -16,6 +17,7 @@ app = FastAPI(
     title="RPG KB",
     version="0.2.0",
     openapi_tags=tags_metadata,
+    default_response_class=ORJSONResponse,
 )
 
 # Keep CORS permissive in dev; tighten in prod as needed.
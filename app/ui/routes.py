@@ -1,72 +1,340 @@
 from __future__ import annotations
 
-import json
-from uuid import UUID
-
-from fastapi import APIRouter, Form, HTTPException, Request
-from fastapi.responses import HTMLResponse, RedirectResponse
-from sqlalchemy import text
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Mapping, Tuple
+from uuid import UUID, uuid4
+
+import orjson
+from fastapi import APIRouter, Depends, Form, HTTPException, Query, Request
+from fastapi.responses import HTMLResponse, RedirectResponse, Response, StreamingResponse
+from sqlalchemy import bindparam, text
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
 from sqlalchemy.exc import IntegrityError
-from starlette.templating import Jinja2Templates
+from starlette.status import HTTP_303_SEE_OTHER
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
+from markupsafe import Markup, escape
 
-from app.core.db import db_session
+from app.api import cache
+from app.core.config import settings
+from app.core.db import async_db_session, get_async_autocommit_db, get_async_db
 
 router = APIRouter(include_in_schema=False)
 
-templates = Jinja2Templates(directory="app/ui/templates")
+# One Environment for the process: each template is compiled once and kept (no
+# cache eviction), and the bytecode cache spares recompiling after a restart.
+# Templates are only re-checked on disk in dev (APP_ENV=dev), where they are edited live.
+# Rendering is async so a page can be streamed while its rows are still being fetched;
+# async templates compile to different code, hence their own bytecode file pattern.
+env = Environment(
+    loader=FileSystemLoader(Path(__file__).parent / "templates"),
+    autoescape=select_autoescape(["html"]),
+    auto_reload=settings.app_env == "dev",
+    cache_size=-1,
+    bytecode_cache=FileSystemBytecodeCache(pattern="__jinja2_async_%s.cache"),
+    enable_async=True,
+)
+for _name in (
+    "campaigns_list.html",
+    "campaign_form.html",
+    "_campaign_form_fields.html",
+    "campaign_kb.html",
+    "source_form.html",
+):
+    env.get_template(_name)
+
+
+# Statements are built once: handlers reuse the same TextClause objects. Id binds
+# are typed so the path's UUID goes to the driver as is, not through its text form.
+_ID = bindparam("id", type_=PGUUID(as_uuid=True))
+_CID = bindparam("cid", type_=PGUUID(as_uuid=True))
+
+# A page of the list; ORDER BY name walks the index of the UNIQUE (name) constraint,
+# so Postgres stops after LIMIT rows instead of sorting the table.
+_SQL_CAMPAIGNS_LIST = text(
+    """
+    SELECT id, name, system, description, embedding_model, embedding_dim
+    FROM campaigns
+    ORDER BY name
+    LIMIT :limit OFFSET :offset
+    """
+)
+
+# Validator for the list pages, without running the page query: every write to
+# campaigns changes it. Inserts and updates set updated_at (the UI's UPDATE and the
+# API's patch through the column's onupdate), deletes change the count.
+_SQL_CAMPAIGNS_LIST_ETAG = text("SELECT count(*), max(updated_at) FROM campaigns")
+
+_UI_PAGE_SIZE_MAX = 200
+
+# NOTE: SQLAlchemy's text() parsing can choke on Postgres '::jsonb' shorthand.
+# Use CAST(:config AS jsonb) instead.
+_SQL_CAMPAIGN_INSERT = text(
+    """
+    INSERT INTO campaigns (name, system, description, config, embedding_model, embedding_dim)
+    VALUES (:name, :system, :description, CAST(:config AS jsonb), :embedding_model, :embedding_dim)
+    RETURNING id
+    """
+)
+
+_SQL_CAMPAIGN_SELECT_BY_ID = text(
+    """
+    SELECT id, name, system, description, config, embedding_model, embedding_dim
+    FROM campaigns
+    WHERE id = :id
+    """
+).bindparams(_ID)
+
+_SQL_CAMPAIGN_UPDATE = text(
+    """
+    UPDATE campaigns
+    SET name = :name,
+        system = :system,
+        description = :description,
+        config = CAST(:config AS jsonb),
+        embedding_model = :embedding_model,
+        embedding_dim = :embedding_dim,
+        updated_at = now()
+    WHERE id = :id
+    RETURNING id
+    """
+).bindparams(_ID)
+
+_SQL_CAMPAIGN_DELETE = text("DELETE FROM campaigns WHERE id = :id RETURNING id").bindparams(_ID)
+
+_SQL_SOURCES_BY_CAMPAIGN = text(
+    """
+    SELECT id, name, kind, root_path, enabled, recursive, follow_symlinks,
+           include_globs, exclude_globs, change_detection,
+           last_scan_at, last_ingest_at
+    FROM campaign_sources
+    WHERE campaign_id = :cid
+    ORDER BY created_at DESC
+    """
+).bindparams(_CID)
+
+_SQL_SOURCE_INSERT = text(
+    """
+    INSERT INTO campaign_sources
+      (campaign_id, name, kind, root_path, recursive, follow_symlinks,
+       include_globs, exclude_globs, change_detection, enabled)
+    VALUES
+      (:cid, :name, :kind, :root, :rec, :sym, :inc, :exc, :cd, :en)
+    """
+).bindparams(_CID)
+
+# RETURNING hands back the campaign to redirect to, without a SELECT first.
+_SQL_SOURCE_DELETE_RETURNING = text(
+    "DELETE FROM campaign_sources WHERE id = :id RETURNING campaign_id"
+).bindparams(_ID)
+
+
+# One glob per non-blank line, surrounding whitespace (incl. the \r of CRLF form
+# posts) excluded: a single findall per field.
+_GLOB_LINE_RE = re.compile(r"^[^\S\n]*(\S.*?)[^\S\n]*$", re.MULTILINE)
+
+
+def _parse_ok(raw: str) -> bool:
+    try:
+        orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        return False
+    return True
 
 
-@router.get("/campaigns", response_class=HTMLResponse)
-def ui_campaigns(request: Request, msg: str | None = None, error: str | None = None):
-    """List campaigns with actions."""
-    with db_session() as db:
-        rows = (
-            db.execute(
-                text(
-                    """
-                    SELECT id, name, system, description, embedding_model, embedding_dim
-                    FROM campaigns
-                    ORDER BY name
-                    """
-                )
-            )
-            .mappings()
-            .all()
+# Resubmits (retries, double clicks, a form sent back after another field's error)
+# usually carry the same config text; its verdict is kept for the last few seen.
+# Large blobs are checked every time rather than pinned in memory as cache keys.
+_parse_ok_cached = lru_cache(maxsize=256)(_parse_ok)
+_JSON_VERDICT_CACHE_MAX = 64 * 1024
+
+
+def _is_valid_json(raw: str) -> bool:
+    if len(raw) > _JSON_VERDICT_CACHE_MAX:
+        return _parse_ok(raw)
+    return _parse_ok_cached(raw)
+
+
+def _escaped(values: Mapping[str, Any]) -> Dict[str, Any]:
+    """Copy of a row/form with its strings HTML-escaped up front, as Markup.
+
+    markupsafe's escape runs in C; autoescape then sees Markup and passes the value
+    through, instead of escaping it again on the template side.
+    """
+    return {k: escape(v) if isinstance(v, str) else v for k, v in values.items()}
+
+
+async def _render(name: str, context: Dict[str, Any], status_code: int = 200) -> HTMLResponse:
+    return HTMLResponse(await env.get_template(name).render_async(context), status_code=status_code)
+
+
+_STREAM_CHUNK = 8192
+
+
+async def _stream(name: str, context: Dict[str, Any]) -> AsyncIterator[str]:
+    """Render a template incrementally, in chunks of about _STREAM_CHUNK characters.
+
+    Jinja yields a piece per template node; sending those one by one would cost a
+    socket write for every few bytes of markup.
+    """
+    buf: list[str] = []
+    size = 0
+    async for part in env.get_template(name).generate_async(context):
+        buf.append(part)
+        size += len(part)
+        if size >= _STREAM_CHUNK:
+            yield "".join(buf)
+            buf.clear()
+            size = 0
+    if buf:
+        yield "".join(buf)
+
+
+# campaign_form.html around its fields depends only on (mode, error), and the errors
+# are fixed strings: that part is rendered once per pair, split where the fields go.
+# A rejected submit (bad JSON, duplicate name) then only renders the fields template.
+_FORM_FIELDS_SLOT = "\x00fields\x00"
+_campaign_form_shells: Dict[Tuple[str, str | None], Tuple[str, str]] = {}
+
+
+async def _campaign_form_shell(mode: str, error: str | None) -> Tuple[str, str]:
+    shell = _campaign_form_shells.get((mode, error))
+    if shell is None:
+        html = await env.get_template("campaign_form.html").render_async(
+            mode=mode, error=error, fields=Markup(_FORM_FIELDS_SLOT)
         )
-    return templates.TemplateResponse(
-        "campaigns_list.html",
-        {
-            "request": request,
-            "campaigns": [dict(r) for r in rows],
-            "msg": msg,
-            "error": error,
-        },
-    )
+        head, _, tail = html.partition(_FORM_FIELDS_SLOT)
+        shell = (head, tail)
+        # Templates are edited live in dev; don't pin an old rendering.
+        if not env.auto_reload:
+            _campaign_form_shells[(mode, error)] = shell
+    return shell
+
+
+async def _render_campaign_form(
+    request: Request,
+    *,
+    mode: str,
+    values: Dict[str, Any],
+    campaign_id: UUID | None = None,
+    error: str | None = None,
+    status_code: int = 200,
+) -> HTMLResponse:
+    """campaign_form.html for create or edit; `values` fills the form fields."""
+    head, tail = await _campaign_form_shell(mode, error)
+    context = {"request": request, "mode": mode, "campaign": _escaped(values)}
+    if campaign_id is not None:
+        context["campaign_id"] = str(campaign_id)
+    fields = await env.get_template("_campaign_form_fields.html").render_async(context)
+    return HTMLResponse(head + fields + tail, status_code=status_code)
+
+
+# Post/redirect/get targets of the campaign handlers.
+_REDIRECTS = {
+    "list": "/ui/campaigns",
+    "created": "/ui/campaigns?msg=Campaign+created",
+    "updated": "/ui/campaigns?msg=Campaign+updated",
+    "deleted": "/ui/campaigns?msg=Campaign+deleted",
+    "not_found": "/ui/campaigns?error=Campaign+not+found",
+    "fk": "/ui/campaigns?error=Cannot+delete+campaign+(check+dependencies)",
+}
+
+
+def _redirect(key: str) -> RedirectResponse:
+    return RedirectResponse(url=_REDIRECTS[key], status_code=HTTP_303_SEE_OTHER)
+
+
+# Mixed into page ETags so a restart (e.g. a deploy with new templates) doesn't
+# keep serving 304s for markup the browser cached from the old process.
+_ETAG_SALT = uuid4().hex[:8]
+
+
+def _if_none_match(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = {t.strip().removeprefix("W/") for t in header.split(",")}
+    return etag in tags or "*" in tags
+
+
+async def _campaign_rows(params: Dict[str, Any], page_size: int, pager: Dict[str, bool]):
+    """Rows of one list page as the cursor delivers them.
+
+    The query asks for one row past the page; seeing it sets pager["has_next"]. The
+    session lives as long as the iteration, i.e. until the template has used the rows.
+    """
+    async with async_db_session() as db:
+        result = await db.stream(_SQL_CAMPAIGNS_LIST, params, execution_options={"yield_per": 100})
+        n = 0
+        async for row in result.mappings():
+            if n == page_size:
+                pager["has_next"] = True
+                break
+            n += 1
+            yield _escaped(row)
+
+
+@router.get("/campaigns", response_class=HTMLResponse)
+async def ui_campaigns(
+    request: Request,
+    msg: str | None = None,
+    error: str | None = None,
+    page: int = Query(0, ge=0),
+    page_size: int = Query(50, ge=1),
+):
+    """List campaigns with actions, a page at a time.
+
+    Answers 304 when the browser's copy is current: the validator query is much
+    cheaper than fetching and rendering the page. msg/error/page are part of the URL,
+    so they need no place in the ETag. Otherwise the page is streamed, rows being
+    rendered as they come off the cursor.
+
+    The validator is read before the page, on its own snapshot: a write in between
+    makes the body newer than its ETag, which only costs that client a full response
+    next time, never a stale 304.
+    """
+    page_size = min(page_size, _UI_PAGE_SIZE_MAX)
+    # One row past the page tells whether there is a next one.
+    params = {"limit": page_size + 1, "offset": page * page_size}
+    async with async_db_session() as db:
+        count, last_write = (await db.execute(_SQL_CAMPAIGNS_LIST_ETAG)).one()
+    etag = f'"{_ETAG_SALT}-{count}-{last_write.timestamp() if last_write else 0}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _if_none_match(request, etag):
+        return Response(status_code=304, headers=headers)
+    pager = {"has_next": False}
+    context = {
+        "request": request,
+        "campaigns": _campaign_rows(params, page_size, pager),
+        "pager": pager,
+        "page": page,
+        "page_size": page_size,
+        "msg": msg,
+        "error": error,
+    }
+    return StreamingResponse(_stream("campaigns_list.html", context), media_type="text/html", headers=headers)
 
 
 @router.get("/campaigns/new", response_class=HTMLResponse)
-def ui_campaign_new(request: Request):
+async def ui_campaign_new(request: Request):
     """Create campaign form."""
-    return templates.TemplateResponse(
-        "campaign_form.html",
-        {
-            "request": request,
-            "mode": "create",
-            "campaign": {
-                "name": "",
-                "system": "v5",
-                "description": "",
-                "embedding_model": "nomic-embed-text",
-                "embedding_dim": 768,
-                "config": "{}",
-            },
-            "error": None,
+    return await _render_campaign_form(
+        request,
+        mode="create",
+        values={
+            "name": "",
+            "system": "v5",
+            "description": "",
+            "embedding_model": "nomic-embed-text",
+            "embedding_dim": 768,
+            "config": "{}",
         },
     )
 
 
 @router.post("/campaigns/new")
-def ui_campaign_create(
+async def ui_campaign_create(
     request: Request,
     name: str = Form(...),
     system: str = Form(...),
@@ -74,118 +342,69 @@ def ui_campaign_create(
     embedding_model: str = Form("nomic-embed-text"),
     embedding_dim: int = Form(768),
     config_json: str = Form("{}"),
+    db=Depends(get_async_autocommit_db),
 ):
+    form = {
+        "name": name,
+        "system": system,
+        "description": description,
+        "embedding_model": embedding_model,
+        "embedding_dim": embedding_dim,
+        "config": config_json,
+    }
+    # Postgres gets the text as entered via CAST(... AS jsonb).
+    config_json = config_json or "{}"
+    if not _is_valid_json(config_json):
+        return await _render_campaign_form(
+            request, mode="create", values=form, error="Config must be valid JSON.", status_code=400
+        )
+
     try:
-        config = json.loads(config_json or "{}")
-    except Exception:
-        return templates.TemplateResponse(
-            "campaign_form.html",
+        await db.execute(
+            _SQL_CAMPAIGN_INSERT,
             {
-                "request": request,
-                "mode": "create",
-                "campaign": {
-                    "name": name,
-                    "system": system,
-                    "description": description,
-                    "embedding_model": embedding_model,
-                    "embedding_dim": embedding_dim,
-                    "config": config_json,
-                },
-                "error": "Config must be valid JSON.",
+                "name": name,
+                "system": system,
+                "description": description or None,
+                "config": config_json,
+                "embedding_model": embedding_model,
+                "embedding_dim": embedding_dim,
             },
-            status_code=400,
+        )
+    except IntegrityError:
+        return await _render_campaign_form(
+            request, mode="create", values=form, error="Campaign name already exists.", status_code=409
         )
 
-    q = text(
-        """
-        INSERT INTO campaigns (name, system, description, config, embedding_model, embedding_dim)
-        -- NOTE: SQLAlchemy's text() parsing can choke on Postgres '::jsonb' shorthand.
-        -- Use CAST(:config AS jsonb) instead.
-        VALUES (:name, :system, :description, CAST(:config AS jsonb), :embedding_model, :embedding_dim)        RETURNING id
-        """
-    )
-
-    with db_session() as db:
-        try:
-            db.execute(
-                q,
-                {
-                    "name": name,
-                    "system": system,
-                    "description": description or None,
-                    "config": json.dumps(config),
-                    "embedding_model": embedding_model,
-                    "embedding_dim": embedding_dim,
-                },
-            ).scalar_one()
-            db.commit()
-        except IntegrityError:
-            db.rollback()
-            return templates.TemplateResponse(
-                "campaign_form.html",
-                {
-                    "request": request,
-                    "mode": "create",
-                    "campaign": {
-                        "name": name,
-                        "system": system,
-                        "description": description,
-                        "embedding_model": embedding_model,
-                        "embedding_dim": embedding_dim,
-                        "config": config_json,
-                    },
-                    "error": "Campaign name already exists.",
-                },
-                status_code=409,
-            )
-
-    return RedirectResponse(url="/ui/campaigns?msg=Campaign+created", status_code=303)
+    return _redirect("created")
 
 
 @router.get("/campaigns/{campaign_id}/edit", response_class=HTMLResponse)
-def ui_campaign_edit(request: Request, campaign_id: UUID):
-    with db_session() as db:
-        row = (
-            db.execute(
-                text(
-                    """
-                    SELECT id, name, system, description, config, embedding_model, embedding_dim
-                    FROM campaigns
-                    WHERE id = :id
-                    """
-                ),
-                {"id": str(campaign_id)},
-            )
-            .mappings()
-            .first()
-        )
-        if not row:
-            raise HTTPException(status_code=404, detail="Campaign not found")
+async def ui_campaign_edit(request: Request, campaign_id: UUID, db=Depends(get_async_db)):
+    row = (await db.execute(_SQL_CAMPAIGN_SELECT_BY_ID, {"id": campaign_id})).mappings().first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Campaign not found")
 
     c = dict(row)
-    return templates.TemplateResponse(
-        "campaign_form.html",
-        {
-            "request": request,
-            "mode": "edit",
-            "campaign_id": str(campaign_id),
-            "campaign": {
-                "name": c.get("name") or "",
-                "system": c.get("system") or "v5",
-                "description": c.get("description") or "",
-                "embedding_model": c.get("embedding_model") or "nomic-embed-text",
-                "embedding_dim": c.get("embedding_dim") or 768,
-                "config": json.dumps(
-                    c.get("config") or {}, indent=2, ensure_ascii=False
-                ),
-            },
-            "error": None,
+    return await _render_campaign_form(
+        request,
+        mode="edit",
+        campaign_id=campaign_id,
+        values={
+            "name": c.get("name") or "",
+            "system": c.get("system") or "v5",
+            "description": c.get("description") or "",
+            "embedding_model": c.get("embedding_model") or "nomic-embed-text",
+            "embedding_dim": c.get("embedding_dim") or 768,
+            "config": orjson.dumps(
+                c.get("config") or {}, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+            ).decode(),
         },
     )
 
 
 @router.post("/campaigns/{campaign_id}/edit")
-def ui_campaign_update(
+async def ui_campaign_update(
     request: Request,
     campaign_id: UUID,
     name: str = Form(...),
@@ -194,139 +413,77 @@ def ui_campaign_update(
     embedding_model: str = Form("nomic-embed-text"),
     embedding_dim: int = Form(768),
     config_json: str = Form("{}"),
+    db=Depends(get_async_autocommit_db),
 ):
-    try:
-        config = json.loads(config_json or "{}")
-    except Exception:
-        return templates.TemplateResponse(
-            "campaign_form.html",
-            {
-                "request": request,
-                "mode": "edit",
-                "campaign_id": str(campaign_id),
-                "campaign": {
-                    "name": name,
-                    "system": system,
-                    "description": description,
-                    "embedding_model": embedding_model,
-                    "embedding_dim": embedding_dim,
-                    "config": config_json,
-                },
-                "error": "Config must be valid JSON.",
-            },
-            status_code=400,
+    form = {
+        "name": name,
+        "system": system,
+        "description": description,
+        "embedding_model": embedding_model,
+        "embedding_dim": embedding_dim,
+        "config": config_json,
+    }
+    config_json = config_json or "{}"
+    if not _is_valid_json(config_json):
+        return await _render_campaign_form(
+            request, mode="edit", campaign_id=campaign_id, values=form, error="Config must be valid JSON.", status_code=400
         )
 
-    q = text(
-        """
-        UPDATE campaigns
-        SET name = :name,
-            system = :system,
-            description = :description,
-            config = :config::jsonb,
-            embedding_model = :embedding_model,
-            embedding_dim = :embedding_dim
-        WHERE id = :id
-        RETURNING id
-        """
-    )
-
-    with db_session() as db:
-        try:
-            updated = db.execute(
-                q,
+    try:
+        updated = (
+            await db.execute(
+                _SQL_CAMPAIGN_UPDATE,
                 {
-                    "id": str(campaign_id),
+                    "id": campaign_id,
                     "name": name,
                     "system": system,
                     "description": description or None,
-                    "config": json.dumps(config),
+                    "config": config_json,
                     "embedding_model": embedding_model,
                     "embedding_dim": embedding_dim,
                 },
-            ).scalar()
-            if not updated:
-                db.rollback()
-                raise HTTPException(status_code=404, detail="Campaign not found")
-            db.commit()
-        except IntegrityError:
-            db.rollback()
-            return templates.TemplateResponse(
-                "campaign_form.html",
-                {
-                    "request": request,
-                    "mode": "edit",
-                    "campaign_id": str(campaign_id),
-                    "campaign": {
-                        "name": name,
-                        "system": system,
-                        "description": description,
-                        "embedding_model": embedding_model,
-                        "embedding_dim": embedding_dim,
-                        "config": config_json,
-                    },
-                    "error": "Update violates uniqueness constraint (campaign name).",
-                },
-                status_code=409,
             )
+        ).scalar()
+        if not updated:
+            raise HTTPException(status_code=404, detail="Campaign not found")
+    except IntegrityError:
+        return await _render_campaign_form(
+            request, mode="edit", campaign_id=campaign_id, values=form, error="Update violates uniqueness constraint (campaign name).", status_code=409
+        )
 
-    return RedirectResponse(url="/ui/campaigns?msg=Campaign+updated", status_code=303)
+    # The API's GET-by-id cache would otherwise keep serving the old row.
+    cache.invalidate("campaign", campaign_id)
+    return _redirect("updated")
 
 
 @router.post("/campaigns/{campaign_id}/delete")
-def ui_campaign_delete(campaign_id: UUID):
-    with db_session() as db:
-        try:
-            deleted = db.execute(
-                text("DELETE FROM campaigns WHERE id = :id RETURNING id"),
-                {"id": str(campaign_id)},
-            ).scalar()
-            if not deleted:
-                db.rollback()
-                return RedirectResponse(
-                    url="/ui/campaigns?error=Campaign+not+found", status_code=303
-                )
-            db.commit()
-        except Exception:
-            db.rollback()
-            # likely FK constraint
-            return RedirectResponse(
-                url="/ui/campaigns?error=Cannot+delete+campaign+(check+dependencies)",
-                status_code=303,
-            )
+async def ui_campaign_delete(campaign_id: UUID, db=Depends(get_async_autocommit_db)):
+    try:
+        deleted = (await db.execute(_SQL_CAMPAIGN_DELETE, {"id": campaign_id})).scalar()
+        if not deleted:
+            return _redirect("not_found")
+    except Exception:
+        # likely FK constraint
+        return _redirect("fk")
 
-    return RedirectResponse(url="/ui/campaigns?msg=Campaign+deleted", status_code=303)
+    # As the API's delete: it cascades to workspaces, sources, runs and documents.
+    cache.clear()
+    return _redirect("deleted")
 
 
 @router.get("/ui/campaigns/{campaign_id}/kb")
-def ui_campaign_kb(request: Request, campaign_id: UUID, db=Depends(get_db)):
-    sources = (
-        db.execute(
-            text(
-                """
-            SELECT id, name, kind, root_path, enabled, recursive, follow_symlinks,
-                   include_globs, exclude_globs, change_detection,
-                   last_scan_at, last_ingest_at
-            FROM campaign_sources
-            WHERE campaign_id = :cid
-            ORDER BY created_at DESC
-        """
-            ),
-            {"cid": str(campaign_id)},
-        )
-        .mappings()
-        .all()
-    )
+async def ui_campaign_kb(request: Request, campaign_id: UUID, db=Depends(get_async_db)):
+    sources = (await db.execute(_SQL_SOURCES_BY_CAMPAIGN, {"cid": campaign_id})).mappings().all()
 
-    return templates.TemplateResponse(
+    return await _render(
         "campaign_kb.html",
         {"request": request, "campaign_id": str(campaign_id), "sources": sources},
     )
 
 
 @router.get("/ui/campaigns/{campaign_id}/sources/new")
-def ui_source_new(request: Request, campaign_id: UUID):
-    return templates.TemplateResponse(
+async def ui_source_new(request: Request, campaign_id: UUID):
+    return await _render(
         "source_form.html",
         {
             "request": request,
@@ -338,7 +495,7 @@ def ui_source_new(request: Request, campaign_id: UUID):
 
 
 @router.post("/ui/campaigns/{campaign_id}/sources/new")
-def ui_source_create(
+async def ui_source_create(
     request: Request,
     campaign_id: UUID,
     name: str = Form(...),
@@ -350,15 +507,15 @@ def ui_source_create(
     exclude_globs_raw: str = Form("**/.obsidian/**\n**/.git/**\n**/node_modules/**"),
     change_detection: str = Form("auto"),
     enabled: bool = Form(True),
-    db=Depends(get_db),
+    db=Depends(get_async_autocommit_db),
 ):
     # parse one glob per line
-    include_globs = [ln.strip() for ln in include_globs_raw.splitlines() if ln.strip()]
-    exclude_globs = [ln.strip() for ln in exclude_globs_raw.splitlines() if ln.strip()]
+    include_globs = _GLOB_LINE_RE.findall(include_globs_raw)
+    exclude_globs = _GLOB_LINE_RE.findall(exclude_globs_raw)
 
     # Basic sanity
     if not root_path.strip():
-        return templates.TemplateResponse(
+        return await _render(
             "source_form.html",
             {
                 "request": request,
@@ -369,18 +526,10 @@ def ui_source_create(
             status_code=400,
         )
 
-    db.execute(
-        text(
-            """
-            INSERT INTO campaign_sources
-              (campaign_id, name, kind, root_path, recursive, follow_symlinks,
-               include_globs, exclude_globs, change_detection, enabled)
-            VALUES
-              (:cid, :name, :kind, :root, :rec, :sym, :inc, :exc, :cd, :en)
-        """
-        ),
+    await db.execute(
+        _SQL_SOURCE_INSERT,
         {
-            "cid": str(campaign_id),
+            "cid": campaign_id,
             "name": name,
             "kind": kind,
             "root": root_path.strip(),
@@ -393,7 +542,6 @@ def ui_source_create(
             "en": bool(enabled),
         },
     )
-    db.commit()
 
     return RedirectResponse(
         f"/ui/campaigns/{campaign_id}/kb", status_code=HTTP_303_SEE_OTHER
@@ -401,24 +549,15 @@ def ui_source_create(
 
 
 @router.post("/ui/sources/{source_id}/delete")
-def ui_source_delete(source_id: UUID, request: Request, db=Depends(get_db)):
-    # find campaign_id for redirect
-    row = (
-        db.execute(
-            text("SELECT campaign_id FROM campaign_sources WHERE id = :id"),
-            {"id": str(source_id)},
-        )
-        .mappings()
-        .first()
-    )
-    if row:
-        cid = row["campaign_id"]
-        db.execute(
-            text("DELETE FROM campaign_sources WHERE id = :id"), {"id": str(source_id)}
-        )
-        db.commit()
+async def ui_source_delete(source_id: UUID, request: Request, db=Depends(get_async_autocommit_db)):
+    cid = (await db.execute(_SQL_SOURCE_DELETE_RETURNING, {"id": source_id})).scalar()
+    if cid is not None:
+        # As the API's delete: documents of the source's files lose their source_file_id.
+        cache.invalidate("source", source_id)
+        cache.invalidate_kind("document")
+        cache.clear_counts()
         return RedirectResponse(
             f"/ui/campaigns/{cid}/kb", status_code=HTTP_303_SEE_OTHER
         )
 
-    return RedirectResponse("/ui/campaigns", status_code=HTTP_303_SEE_OTHER)
+    return _redirect("list")
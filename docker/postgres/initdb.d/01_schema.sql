@@ -71,6 +71,8 @@ CREATE TABLE IF NOT EXISTS source_folders (
     UNIQUE (source_id, rel_path)
 );
 CREATE INDEX IF NOT EXISTS source_folders_parent ON source_folders (parent_id);
+-- folders list: WHERE source_id = :sid ORDER BY depth, rel_path
+CREATE INDEX IF NOT EXISTS source_folders_source_depth_path ON source_folders (source_id, depth, rel_path);
 CREATE TABLE IF NOT EXISTS source_files (
     id uuid PRIMARY KEY DEFAULT uuid_generate_v4(),
     source_id uuid NOT NULL REFERENCES campaign_sources(id) ON DELETE CASCADE,
@@ -99,6 +101,12 @@ CREATE TABLE IF NOT EXISTS source_files (
 CREATE INDEX IF NOT EXISTS source_files_source ON source_files (source_id);
 CREATE INDEX IF NOT EXISTS source_files_status ON source_files (source_id, status);
 CREATE INDEX IF NOT EXISTS source_files_changed_hint ON source_files (source_id, mtime_epoch, size_bytes);
+-- files list: WHERE source_id = :sid [AND status/last_ingest_status] ORDER BY rel_path, id
+CREATE INDEX IF NOT EXISTS source_files_source_relpath ON source_files (source_id, rel_path) INCLUDE (status, last_ingest_status);
+-- substring search (rel_path ILIKE '%q%') in the files list
+CREATE INDEX IF NOT EXISTS source_files_rel_path_trgm ON source_files USING gin (rel_path gin_trgm_ops);
+-- ingest: a source's live files (WHERE source_id = :sid AND status <> 'deleted'), index-only
+CREATE INDEX IF NOT EXISTS source_files_source_live ON source_files (source_id) INCLUDE (rel_path, id, size_bytes, mtime_epoch, sha256, last_ingest_status) WHERE status <> 'deleted';
 CREATE TABLE IF NOT EXISTS ingest_runs (
     id uuid PRIMARY KEY DEFAULT uuid_generate_v4(),
     campaign_id uuid NOT NULL REFERENCES campaigns(id) ON DELETE CASCADE,
@@ -107,7 +115,7 @@ CREATE TABLE IF NOT EXISTS ingest_runs (
     ),
     started_at timestamptz NOT NULL DEFAULT now(),
     finished_at timestamptz,
-    status text NOT NULL DEFAULT 'running' CHECK (status IN ('running', 'ok', 'partial', 'error')),
+    status text NOT NULL DEFAULT 'running' CHECK (status IN ('queued', 'running', 'ok', 'partial', 'error')),
     stats jsonb NOT NULL DEFAULT '{}',
     error text
 );
@@ -120,7 +128,9 @@ CREATE TABLE IF NOT EXISTS ingest_run_files (
     error text,
     PRIMARY KEY (ingest_run_id, source_file_id)
 );
-CREATE INDEX IF NOT EXISTS ingest_runs_campaign_time ON ingest_runs (campaign_id, started_at DESC);
+-- runs list, per campaign and across campaigns: ORDER BY started_at DESC NULLS LAST, id DESC
+CREATE INDEX IF NOT EXISTS ingest_runs_campaign_started ON ingest_runs (campaign_id, started_at DESC NULLS LAST, id DESC);
+CREATE INDEX IF NOT EXISTS ingest_runs_started ON ingest_runs (started_at DESC NULLS LAST, id DESC);
 CREATE TABLE IF NOT EXISTS kb_documents (
     id uuid PRIMARY KEY DEFAULT uuid_generate_v4(),
     campaign_id uuid NOT NULL REFERENCES campaigns(id) ON DELETE CASCADE,
@@ -145,7 +155,12 @@ CREATE TABLE IF NOT EXISTS kb_documents (
 );
 CREATE INDEX IF NOT EXISTS kb_documents_campaign ON kb_documents (campaign_id);
 CREATE INDEX IF NOT EXISTS kb_documents_type ON kb_documents (campaign_id, doc_type);
+-- ingest: the document of a source file (WHERE campaign_id = :cid AND source_file_id = :fid)
+CREATE UNIQUE INDEX IF NOT EXISTS kb_documents_campaign_source_file ON kb_documents (campaign_id, source_file_id);
+-- keyset pagination of the documents list: (updated_at, id) < cursor
+CREATE INDEX IF NOT EXISTS kb_documents_campaign_updated ON kb_documents (campaign_id, updated_at DESC NULLS LAST, id DESC) INCLUDE (doc_type, title);
 CREATE INDEX IF NOT EXISTS kb_documents_title_trgm ON kb_documents USING gin (title gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS kb_documents_body_trgm ON kb_documents USING gin (body_md gin_trgm_ops);
 CREATE TABLE IF NOT EXISTS kb_chunks (
     id uuid PRIMARY KEY DEFAULT uuid_generate_v4(),
     campaign_id uuid NOT NULL REFERENCES campaigns(id) ON DELETE CASCADE,
@@ -0,0 +1,78 @@
+from pathlib import PurePosixPath
+
+import pytest
+
+from app.kb import globs
+from app.kb.globs import compile_globs, should_include
+
+
+def _matches(pattern: str, path: str) -> bool:
+    rx = compile_globs((pattern,))
+    return rx is not None and rx.match(path) is not None
+
+
+@pytest.mark.parametrize(
+    "pattern, path",
+    [
+        ("*.md", "notes/session.md"),
+        ("*.md", "session.md"),
+        ("notes/*.md", "vault/notes/a.md"),
+        ("notes/*.md", "notes/sub/a.md"),
+        ("**/.git/**", "vault/.git/HEAD"),
+        ("?.md", "a.md"),
+        ("[ab].md", "b.md"),
+        ("[a-c].md", "d.md"),
+        ("[!]].md", "a.md"),
+        ("[!]].md", "].md"),
+        ("[]].md", "].md"),
+        ("[!a-].md", "-.md"),
+        ("[!].md", "x.md"),
+        ("[.md", "[.md"),
+    ],
+)
+def test_matches_like_purepath(pattern, path):
+    assert _matches(pattern, path) == PurePosixPath(path).match(pattern)
+
+
+def test_negated_class_excludes_close_bracket():
+    assert _matches("[!]]", "a")
+    assert not _matches("[!]]", "]")
+    assert not _matches("[!]]", "a/b/]")
+
+
+def test_wildcards_stay_in_one_component():
+    assert not _matches("a*b", "a/b")
+    assert not _matches("a?b", "a/b")
+    assert not _matches("a[!x]b", "a/b")
+
+
+def test_malformed_class_does_not_raise():
+    pattern = "[!][].[]"
+    for path in ("x].[]", "a/x].[]", "[].[]"):
+        assert _matches(pattern, path) == PurePosixPath(path).match(pattern)
+
+
+def test_uncompilable_pattern_is_skipped(monkeypatch, caplog):
+    part_re = globs._part_re
+    monkeypatch.setattr(globs, "_part_re", lambda p: "(" if p == "bad" else part_re(p))
+    compile_globs.cache_clear()
+    try:
+        rx = compile_globs(("bad", "*.md"))
+    finally:
+        compile_globs.cache_clear()
+    assert rx is not None and rx.match("a/b.md")
+    assert "skipping invalid glob 'bad'" in caplog.text
+
+
+def test_empty_and_absolute_patterns_match_nothing():
+    assert compile_globs(()) is None
+    assert compile_globs(("", "/abs/*.md")) is None
+
+
+def test_should_include():
+    inc = compile_globs(("**/*.md",))
+    exc = compile_globs(("**/.obsidian/**",))
+    assert should_include("vault/a.md", inc, exc)
+    assert not should_include("vault/.obsidian/a.md", inc, exc)
+    assert not should_include("vault/a.txt", inc, exc)
+    assert should_include("vault/a.txt", None, None)